@@ -0,0 +1,58 @@
+import random
+import sys
+import threading
+import time
+from modelos import InventarioConcurrente
+
+NUM_INGREDIENTES = 200
+INGREDIENTES_POR_VENTA = 5
+VENTAS_POR_HILO = 20000
+STOCK_INICIAL = 10 ** 9
+
+
+def vender(inventario, ids, ventas, semilla):
+    """
+    Simula las ventas de un vendedor: revisa y resta varios ingredientes de forma atómica.
+    """
+    rng = random.Random(semilla)
+    for _ in range(ventas):
+        receta = rng.sample(ids, INGREDIENTES_POR_VENTA)
+        with inventario.bloquear(receta):
+            if all(inventario.obtener_cantidad(id_ing) >= 1 for id_ing in receta):
+                for id_ing in receta:
+                    inventario.restar_cantidad(id_ing, 1)
+
+
+def medir_rendimiento(num_hilos, num_candados):
+    """
+    Devuelve las ventas por segundo con 'num_hilos' vendedores y 'num_candados' candados.
+    """
+    inventario = InventarioConcurrente(num_candados)
+    ids = [f"ing{i}" for i in range(NUM_INGREDIENTES)]
+    for id_ing in ids:
+        inventario.set_cantidad(id_ing, STOCK_INICIAL)
+
+    hilos = [threading.Thread(target=vender, args=(inventario, ids, VENTAS_POR_HILO, i)) for i in range(num_hilos)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    consumido = sum(STOCK_INICIAL - inventario.obtener_cantidad(id_ing) for id_ing in ids)
+    esperado = num_hilos * VENTAS_POR_HILO * INGREDIENTES_POR_VENTA
+    if consumido != esperado:
+        print(f"Error: se consumieron {consumido} unidades, se esperaban {esperado}.")
+
+    return num_hilos * VENTAS_POR_HILO / duracion
+
+
+if __name__ == "__main__":
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]} (GIL {'activo' if gil else 'desactivado'})")
+    print(f"{'hilos':>5} {'1 candado (ventas/s)':>22} {'64 candados (ventas/s)':>24}")
+    for num_hilos in (1, 2, 4, 8):
+        global_ = medir_rendimiento(num_hilos, 1)
+        repartido = medir_rendimiento(num_hilos, 64)
+        print(f"{num_hilos:>5} {global_:>22.0f} {repartido:>24.0f}")
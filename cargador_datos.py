@@ -1,22 +1,102 @@
 
 import requests
 import json
-from modelos import Ingrediente, HotDog 
+from modelos import Ingrediente, HotDog, huella_receta
+from metricas import medir
+from unidades import resolver_cantidades
 
 class CargadorDatos:
     """
     Se encarga de leer los JSON (remotos y locales) y crear objetos.
+    Las respuestas de la API se guardan en memoria, compartidas entre instancias,
+    para no volver a descargarlas en el mismo proceso.
     """
+    _respuestas_cache = {}
+    _catalogos_cache = {}
+    _hotdogs_por_huella = {}
+
     def __init__(self, url_menu, url_ingredientes):
         self.url_menu = url_menu
         self.url_ingredientes = url_ingredientes
 
+    def _obtener_json(self, url):
+        """
+        Descarga y decodifica el JSON de 'url', usando la caché si ya se descargó.
+        """
+        if url not in CargadorDatos._respuestas_cache:
+            resp = requests.get(url)
+            resp.raise_for_status()
+            CargadorDatos._respuestas_cache[url] = resp.json()
+        return CargadorDatos._respuestas_cache[url]
+
+    @classmethod
+    def limpiar_cache(cls):
+        cls._respuestas_cache.clear()
+        cls._catalogos_cache.clear()
+        cls._hotdogs_por_huella.clear()
+
+    def obtener_catalogo(self):
+        """
+        Devuelve (ingredientes, hotdogs) ya construidos para estas URLs.
+        El resultado se comparte entre instancias: quien lo use debe copiar los dicts
+        antes de modificarlos. Las cargas fallidas (vacías) no se guardan.
+        """
+        clave = (self.url_menu, self.url_ingredientes)
+        catalogo = CargadorDatos._catalogos_cache.get(clave)
+        if catalogo is None:
+            ingredientes = self.cargar_ingredientes_desde_api()
+            hotdogs = self.cargar_menu_desde_api(ingredientes)
+            catalogo = (ingredientes, hotdogs)
+            if ingredientes and hotdogs:
+                CargadorDatos._catalogos_cache[clave] = catalogo
+        return catalogo
+
+    @staticmethod
+    def construir_hotdog(item, ingredientes_db):
+        """
+        Crea un HotDog a partir de un dict del menú (API o archivo local).
+        Si ya se construyó antes un hot dog con el mismo nombre, la misma huella
+        y los mismos objetos Ingrediente, se reutiliza ese objeto.
+        Lanza KeyError si falta un ingrediente y ValueError si una cantidad no es válida.
+        """
+        pan = ingredientes_db[item["Pan"]]
+        salchicha = ingredientes_db[item["Salchicha"]]
+        toppings = [ingredientes_db[t] for t in item["toppings"]]
+        lista_salsas_nombres = item.get("salsas", item.get("Salsas", []))
+        salsas = [ingredientes_db[s] for s in lista_salsas_nombres]
+        acompanante_nombre = item["Acompañante"]
+        acompanante = ingredientes_db.get(acompanante_nombre) if acompanante_nombre else None
+        cantidades = resolver_cantidades(item.get("cantidades"), ingredientes_db)
+        precio = item.get("precio", 0.0)
+
+        huella = huella_receta(pan.id, salchicha.id, [t.id for t in toppings], [s.id for s in salsas],
+                               acompanante.id if acompanante else None, cantidades, precio)
+        clave = (item["nombre"], huella)
+        previo = CargadorDatos._hotdogs_por_huella.get(clave)
+        componentes = [pan, salchicha] + toppings + salsas + ([acompanante] if acompanante else [])
+        if previo is not None and len(previo.ingredientes_totales()) == len(componentes) and \
+                all(a is b for a, b in zip(previo.ingredientes_totales(), componentes)):
+            return previo
+
+        hd = HotDog(
+            id_=item["nombre"],
+            nombre=item["nombre"],
+            pan=pan,
+            salchicha=salchicha,
+            toppings=toppings,
+            salsas=salsas,
+            acompanante=acompanante,
+            precio=precio,
+            cantidades=cantidades
+        )
+        CargadorDatos._hotdogs_por_huella[clave] = hd
+        return hd
+
+    @medir("cargador.cargar_ingredientes")
     def cargar_ingredientes_desde_api(self):
        
         try:
-            resp = requests.get(self.url_ingredientes)
-            resp.raise_for_status()
-            data_categorias = resp.json()
+            data_categorias = self._obtener_json(self.url_ingredientes)
         except requests.exceptions.RequestException as e:
             print(f"Error fatal al cargar ingredientes desde la API: {e}")
             return {}
@@ -43,18 +123,19 @@ class CargadorDatos:
                     nombre=nombre,
                     categoria=categoria_nombre,
                     tipo=tipo,
-                    longitud=longitud
+                    longitud=longitud,
+                    costo=item.get("costo", 0.0),
+                    unidad=item.get("unidad") or "unidad"
                 )
                 ingredientes_db[ing.id] = ing
 
         return ingredientes_db
 
+    @medir("cargador.cargar_menu")
     def cargar_menu_desde_api(self, ingredientes_db):
        
         try:
-            resp = requests.get(self.url_menu)
-            resp.raise_for_status()
-            data_menu = resp.json()
+            data_menu = self._obtener_json(self.url_menu)
         except requests.exceptions.RequestException as e:
             print(f"Error fatal al cargar menú desde la API: {e}")
             return {}
@@ -65,37 +146,18 @@ class CargadorDatos:
         hotdogs = {}
 
         for item in data_menu:
-            id_ = item["nombre"]
             nombre = item["nombre"]
 
             try:
-
-                pan = ingredientes_db[item["Pan"]]
-                salchicha = ingredientes_db[item["Salchicha"]]
-
-                toppings = [ingredientes_db[t] for t in item["toppings"]]
-                
-                lista_salsas_nombres = item.get("salsas", item.get("Salsas", []))
-                salsas = [ingredientes_db[s] for s in lista_salsas_nombres]
-
-                acompanante_nombre = item["Acompañante"]
-                acompanante = ingredientes_db.get(acompanante_nombre) if acompanante_nombre else None
-
-                
-                hd = HotDog(
-                    id_=id_,
-                    nombre=nombre,
-                    pan=pan,
-                    salchicha=salchicha,
-                    toppings=toppings,
-                    salsas=salsas,
-                    acompanante=acompanante
-                )
+                hd = self.construir_hotdog(item, ingredientes_db)
                 hotdogs[hd.id] = hd
 
             except KeyError as e:
             
                 print(f"Advertencia: No se pudo crear el hot dog '{nombre}'.")
                 print(f"Motivo: El ingrediente '{e.args[0]}' no se encuentra en ingredientes.json.")
+            except ValueError as e:
+                print(f"Advertencia: No se pudo crear el hot dog '{nombre}'.")
+                print(f"Motivo: {e}")
 
         return hotdogs
\ No newline at end of file
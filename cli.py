@@ -0,0 +1,150 @@
+import argparse
+import json
+import sys
+from fachada import FachadaHotDog
+from metricas import METRICAS
+
+USERNAME = "FernandoSapient"
+REPOSITORY = "BPTSP05_2526-1"
+BRANCH = "main"
+MENU_PATH = "menu.json"
+ING_PATH = "ingredientes.json"
+
+MENU_URL = f"https://raw.githubusercontent.com/{USERNAME}/{REPOSITORY}/{BRANCH}/{MENU_PATH}"
+ING_URL = f"https://raw.githubusercontent.com/{USERNAME}/{REPOSITORY}/{BRANCH}/{ING_PATH}"
+
+
+def _parsear_cantidades(pares):
+    """
+    Convierte una lista de 'id=cantidad' en un dict {id: cantidad}.
+    """
+    cantidades = {}
+    for par in pares:
+        id_ing, separador, cantidad = par.rpartition("=")
+        if not separador or not id_ing:
+            raise argparse.ArgumentTypeError(f"Formato inválido '{par}', se esperaba id=cantidad.")
+        try:
+            cantidades[id_ing] = int(cantidad)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"La cantidad de '{id_ing}' debe ser un número entero.")
+        if cantidades[id_ing] < 0:
+            raise argparse.ArgumentTypeError(f"La cantidad de '{id_ing}' no puede ser negativa.")
+    return cantidades
+
+
+def _imprimir_json(data):
+    print(json.dumps(data, indent=4, ensure_ascii=False))
+
+
+def comando_cargar(fachada, args):
+    _imprimir_json(fachada.cargar())
+    return 0
+
+
+def comando_simular(fachada, args):
+    if args.clientes <= 0:
+        print("Error: El número de clientes debe ser positivo.", file=sys.stderr)
+        return 2
+
+    if args.perfil or args.perfil_ruta:
+        reporte, texto_perfil = fachada.perfilar(args.clientes, args.semilla, ruta=args.perfil_ruta)
+        print(texto_perfil, file=sys.stderr)
+    else:
+        reporte = fachada.simular(args.clientes, args.semilla)
+    if not reporte:
+        print("Error: No se pudo generar el reporte (quizás no hay hot dogs).", file=sys.stderr)
+        return 1
+
+    if args.directorio_reporte:
+        fachada.exportar_reporte(reporte, args.directorio_reporte, args.formato)
+    if args.guardar:
+        fachada.guardar()
+
+    _imprimir_json(reporte)
+    return 0
+
+
+def comando_reponer(fachada, args):
+    try:
+        cantidades = _parsear_cantidades(args.cantidades)
+    except argparse.ArgumentTypeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    resultados = fachada.reponer(cantidades, total=args.total)
+    fachada.guardar()
+
+    _imprimir_json(resultados)
+    return 0 if all(resultados.values()) else 1
+
+
+def comando_reporte(fachada, args):
+    _imprimir_json(fachada.inventario(args.umbral))
+    return 0
+
+
+def comando_exportar(fachada, args):
+    fachada.exportar(args.ruta)
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="hotdog", description="Sistema Hot Dog CCS en modo no interactivo.")
+    parser.add_argument("--menu-url", default=MENU_URL)
+    parser.add_argument("--ingredientes-url", default=ING_URL)
+    parser.add_argument("--estado", default="estado_local.json", help="Archivo de estado local.")
+    parser.add_argument("--verboso", action="store_true", help="Muestra los mensajes del sistema.")
+    parser.add_argument("--metricas", default=None, metavar="RUTA",
+                        help="Activa las métricas y las escribe en RUTA al terminar el comando.")
+    parser.add_argument("--formato-metricas", choices=("json", "prometheus"), default="json")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_cargar = subparsers.add_parser("cargar", help="Carga catálogo, menú y estado y muestra un resumen.")
+    p_cargar.set_defaults(funcion=comando_cargar)
+
+    p_simular = subparsers.add_parser("simular", help="Simula un día de ventas.")
+    p_simular.add_argument("clientes", type=int)
+    p_simular.add_argument("--semilla", type=int, default=None)
+    p_simular.add_argument("--guardar", action="store_true", help="Persiste el inventario resultante.")
+    p_simular.add_argument("--directorio-reporte", default=None, help="Exporta gráficos y resumen a este directorio.")
+    p_simular.add_argument("--formato", choices=("png", "svg"), default="png")
+    p_simular.add_argument("--perfil", action="store_true",
+                           help="Ejecuta bajo cProfile y muestra las funciones más costosas en stderr.")
+    p_simular.add_argument("--perfil-ruta", default=None, metavar="RUTA",
+                           help="Guarda también las estadísticas crudas de cProfile (implica --perfil).")
+    p_simular.set_defaults(funcion=comando_simular)
+
+    p_reponer = subparsers.add_parser("reponer", help="Repone existencias (id=cantidad ...).")
+    p_reponer.add_argument("cantidades", nargs="+")
+    p_reponer.add_argument("--total", action="store_true", help="Reemplaza el stock en lugar de sumarlo.")
+    p_reponer.set_defaults(funcion=comando_reponer)
+
+    p_reporte = subparsers.add_parser("reporte", help="Muestra el inventario en JSON.")
+    p_reporte.add_argument("--umbral", type=int, default=None, help="Solo ingredientes con stock <= umbral.")
+    p_reporte.set_defaults(funcion=comando_reporte)
+
+    p_exportar = subparsers.add_parser("exportar", help="Exporta menú e inventario a un archivo JSON.")
+    p_exportar.add_argument("ruta")
+    p_exportar.set_defaults(funcion=comando_exportar)
+
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.metricas:
+        METRICAS.activar()
+    fachada = FachadaHotDog(args.menu_url, args.ingredientes_url, args.estado, silencioso=not args.verboso)
+    codigo = args.funcion(fachada, args)
+
+    # Con HOTDOG_METRICAS=1 y sin --metricas se escriben en los archivos por defecto, como en el menú.
+    if args.metricas:
+        if not fachada.exportar_metricas(args.metricas, args.formato_metricas):
+            return codigo or 1
+    elif METRICAS.activo:
+        fachada.exportar_metricas()
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import bisect
+import heapq
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from modelos import HotDog
+
+
+def _tamano_maximo(maximo, cantidad):
+    return cantidad if maximo is None else min(maximo, cantidad)
+
+
+def _subconjuntos(items, maximo):
+    """
+    Genera perezosamente las tuplas de 0 a 'maximo' elementos de 'items' (todas si 'maximo' es None).
+    """
+    for tamano in range(_tamano_maximo(maximo, len(items)) + 1):
+        yield from itertools.combinations(items, tamano)
+
+
+def _mejores_de_pares(pares, toppings, salsas, acompanantes, max_toppings, max_salsas, top):
+    """
+    Calcula las 'top' combinaciones más producibles para una lista de pares (pan, salchicha).
+    Trabaja solo con tuplas (id, stock) para poder ejecutarse en otro proceso.
+    Devuelve una lista de (capacidad, ids_de_la_combinacion).
+    """
+    mejores = []
+
+    # Ordenar por stock descendente permite cortar en cuanto la cota no alcanza al peor del heap.
+    toppings = sorted(toppings, key=lambda item: item[1], reverse=True)
+    salsas = sorted(salsas, key=lambda item: item[1], reverse=True)
+    acompanantes = [("", math.inf)] + sorted(acompanantes, key=lambda item: item[1], reverse=True)
+
+    for (pan, stock_pan), (salchicha, stock_salchicha) in pares:
+        base = min(stock_pan, stock_salchicha)
+        if len(mejores) == top and base <= mejores[0][0]:
+            continue
+
+        for combo_toppings in _subconjuntos(toppings, max_toppings):
+            cota_toppings = min([base] + [stock for _, stock in combo_toppings])
+            if len(mejores) == top and cota_toppings <= mejores[0][0]:
+                continue
+
+            for combo_salsas in _subconjuntos(salsas, max_salsas):
+                cota_salsas = min([cota_toppings] + [stock for _, stock in combo_salsas])
+                if len(mejores) == top and cota_salsas <= mejores[0][0]:
+                    continue
+
+                for acompanante, stock_acomp in acompanantes:
+                    capacidad = min(cota_salsas, stock_acomp)
+                    if len(mejores) == top and capacidad <= mejores[0][0]:
+                        break
+                    ids = (pan, salchicha, tuple(t for t, _ in combo_toppings),
+                           tuple(s for s, _ in combo_salsas), acompanante)
+                    if len(mejores) < top:
+                        heapq.heappush(mejores, (capacidad, ids))
+                    else:
+                        heapq.heapreplace(mejores, (capacidad, ids))
+
+    return mejores
+
+
+class ExploradorCombinaciones:
+    """
+    Enumera los hot dogs válidos que se pueden armar con el catálogo actual
+    (pan x salchicha x toppings x salsas x acompañante) sin construir el producto cartesiano.
+    Por defecto se consideran todos los subconjuntos de toppings y de salsas;
+    'max_toppings' y 'max_salsas' limitan cuántos puede llevar cada hot dog
+    (contar, generar y ranking respetan ese límite).
+    """
+    def __init__(self, gestor_ingredientes, gestor_inventario, max_toppings=None, max_salsas=None):
+        self.gestor_ingredientes = gestor_ingredientes
+        self.gestor_inventario = gestor_inventario
+        self.max_toppings = max_toppings
+        self.max_salsas = max_salsas
+
+    def _por_longitud(self, categoria):
+        """
+        Devuelve los ingredientes de 'categoria' con longitud definida, ordenados por longitud.
+        """
+        con_longitud = [ing for ing in self.gestor_ingredientes.listar_por_categoria(categoria)
+                        if ing.longitud is not None]
+        con_longitud.sort(key=lambda ing: ing.longitud)
+        return con_longitud
+
+    def pares_validos(self):
+        """
+        Genera (pan, [salchichas que caben en ese pan]) usando búsqueda binaria
+        sobre las salchichas ordenadas por longitud.
+        """
+        salchichas = self._por_longitud("Salchicha")
+        longitudes = [s.longitud for s in salchichas]
+        for pan in self._por_longitud("Pan"):
+            limite = bisect.bisect_right(longitudes, pan.longitud)
+            if limite:
+                yield pan, salchichas[:limite]
+
+    def contar(self):
+        """
+        Cuenta las combinaciones válidas sin enumerarlas.
+        """
+        n_toppings = len(self.gestor_ingredientes.listar_por_categoria("toppings"))
+        n_salsas = len(self.gestor_ingredientes.listar_por_categoria("Salsa"))
+        n_acomp = len(self.gestor_ingredientes.listar_por_categoria("Acompañante"))
+
+        variantes_toppings = sum(math.comb(n_toppings, k) for k in range(_tamano_maximo(self.max_toppings, n_toppings) + 1))
+        variantes_salsas = sum(math.comb(n_salsas, k) for k in range(_tamano_maximo(self.max_salsas, n_salsas) + 1))
+        n_pares = sum(len(salchichas) for _, salchichas in self.pares_validos())
+
+        return n_pares * variantes_toppings * variantes_salsas * (n_acomp + 1)
+
+    def _crear_hotdog(self, pan, salchicha, toppings, salsas, acompanante):
+        partes = [pan.nombre, salchicha.nombre] + [t.nombre for t in toppings] + [s.nombre for s in salsas]
+        if acompanante is not None:
+            partes.append(acompanante.nombre)
+        nombre = " + ".join(partes)
+        return HotDog(id_=nombre, nombre=nombre, pan=pan, salchicha=salchicha,
+                      toppings=list(toppings), salsas=list(salsas), acompanante=acompanante)
+
+    def generar(self):
+        """
+        Generador perezoso de todos los HotDog válidos.
+        """
+        toppings = self.gestor_ingredientes.listar_por_categoria("toppings")
+        salsas = self.gestor_ingredientes.listar_por_categoria("Salsa")
+        acompanantes = [None] + self.gestor_ingredientes.listar_por_categoria("Acompañante")
+
+        for pan, salchichas in self.pares_validos():
+            for salchicha in salchichas:
+                for combo_toppings in _subconjuntos(toppings, self.max_toppings):
+                    for combo_salsas in _subconjuntos(salsas, self.max_salsas):
+                        for acompanante in acompanantes:
+                            yield self._crear_hotdog(pan, salchicha, combo_toppings, combo_salsas, acompanante)
+
+    def ranking(self, top=10, procesos=None, pares_por_tarea=64):
+        """
+        Devuelve las 'top' combinaciones que más unidades permiten vender con el stock actual,
+        como una lista de (capacidad, HotDog) ordenada de mayor a menor.
+        Con procesos > 1 los pares (pan, salchicha) se reparten entre varios núcleos.
+        """
+        if top <= 0:
+            return []
+
+        def con_stock(ingredientes):
+            return [(ing.id, self.gestor_inventario.buscar_existencia(ing.id)) for ing in ingredientes]
+
+        pares = [((pan.id, self.gestor_inventario.buscar_existencia(pan.id)), salchicha)
+                 for pan, salchichas in self.pares_validos()
+                 for salchicha in con_stock(salchichas)]
+        toppings = con_stock(self.gestor_ingredientes.listar_por_categoria("toppings"))
+        salsas = con_stock(self.gestor_ingredientes.listar_por_categoria("Salsa"))
+        acompanantes = con_stock(self.gestor_ingredientes.listar_por_categoria("Acompañante"))
+
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+
+        # Los pares más prometedores van primero para que la poda actúe cuanto antes.
+        pares.sort(key=lambda par: min(par[0][1], par[1][1]), reverse=True)
+
+        if procesos <= 1 or len(pares) <= pares_por_tarea:
+            mejores = _mejores_de_pares(pares, toppings, salsas, acompanantes,
+                                        self.max_toppings, self.max_salsas, top)
+        else:
+            bloques = [pares[i:i + pares_por_tarea] for i in range(0, len(pares), pares_por_tarea)]
+            mejores = []
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                futuros = [ejecutor.submit(_mejores_de_pares, bloque, toppings, salsas, acompanantes,
+                                           self.max_toppings, self.max_salsas, top)
+                           for bloque in bloques]
+                for futuro in futuros:
+                    mejores.extend(futuro.result())
+
+        db = self.gestor_ingredientes.ingredientes
+        resultado = []
+        for capacidad, (pan, salchicha, ids_toppings, ids_salsas, acompanante) in heapq.nlargest(top, mejores):
+            hd = self._crear_hotdog(db[pan], db[salchicha], [db[t] for t in ids_toppings],
+                                    [db[s] for s in ids_salsas], db[acompanante] if acompanante else None)
+            resultado.append((capacidad, hd))
+        return resultado
@@ -0,0 +1,92 @@
+import contextlib
+
+
+class IngredienteAgregado:
+    def __init__(self, ingrediente):
+        self.ingrediente = ingrediente
+
+
+class IngredienteEliminado:
+    def __init__(self, id_ingrediente):
+        self.id_ingrediente = id_ingrediente
+
+
+class ExistenciaCambiada:
+    def __init__(self, id_ingrediente, anterior, nueva):
+        self.id_ingrediente = id_ingrediente
+        self.anterior = anterior
+        self.nueva = nueva
+
+
+class HotDogAgregado:
+    def __init__(self, hotdog):
+        self.hotdog = hotdog
+
+
+class HotDogEliminado:
+    def __init__(self, id_hotdog):
+        self.id_hotdog = id_hotdog
+
+
+class BusEventos:
+    """
+    Bus de publicación/suscripción en el mismo proceso.
+    Los gestores publican eventos y los suscriptores (índices, vistas,
+    persistencia) se actualizan sin tener que recalcular todo.
+    Dentro de 'agrupar()' los eventos se acumulan y se entregan al final;
+    los cambios de existencia de un mismo ingrediente se combinan en uno solo.
+    """
+    def __init__(self):
+        self._suscriptores = {}
+        self._pendientes = None
+        self._profundidad = 0
+        self._contador = 0
+
+    def suscribir(self, tipo_evento, funcion):
+        self._suscriptores.setdefault(tipo_evento, []).append(funcion)
+
+    def desuscribir(self, tipo_evento, funcion):
+        funciones = self._suscriptores.get(tipo_evento, [])
+        if funcion in funciones:
+            funciones.remove(funcion)
+
+    def publicar(self, evento):
+        if self._pendientes is None:
+            self._entregar(evento)
+            return
+
+        if isinstance(evento, ExistenciaCambiada):
+            clave = ("existencia", evento.id_ingrediente)
+            previo = self._pendientes.get(clave)
+            if previo is not None:
+                evento = ExistenciaCambiada(evento.id_ingrediente, previo.anterior, evento.nueva)
+                # Se vuelve a insertar para que quede en el orden del último cambio.
+                del self._pendientes[clave]
+        else:
+            self._contador += 1
+            clave = ("evento", self._contador)
+        self._pendientes[clave] = evento
+
+    def _entregar(self, evento):
+        for funcion in self._suscriptores.get(type(evento), ()):
+            funcion(evento)
+
+    @contextlib.contextmanager
+    def agrupar(self):
+        """
+        Acumula los eventos publicados dentro del bloque y los entrega combinados al salir.
+        Se puede anidar; solo el bloque más externo entrega.
+        """
+        if self._profundidad == 0:
+            self._pendientes = {}
+        self._profundidad += 1
+        try:
+            yield
+        finally:
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                pendientes, self._pendientes = self._pendientes, None
+                for evento in pendientes.values():
+                    if isinstance(evento, ExistenciaCambiada) and evento.anterior == evento.nueva:
+                        continue
+                    self._entregar(evento)
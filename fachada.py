@@ -0,0 +1,141 @@
+import contextlib
+import datetime
+import io
+import json
+import random
+from metricas import METRICAS, perfilar_simulacion
+from sistema import SistemaHotDog
+
+
+class FachadaHotDog:
+    """
+    API programática sobre SistemaHotDog para scripts y procesos por lotes.
+    Crear la fachada no descarga nada ni imprime nada: el sistema carga cada
+    etapa la primera vez que se necesita y la reutiliza en las llamadas siguientes.
+    """
+    def __init__(self, url_menu, url_ingredientes, archivo_local="estado_local.json", silencioso=True):
+        self.silencioso = silencioso
+        self.sistema = SistemaHotDog(url_menu, url_ingredientes, archivo_local)
+
+    def _salida(self):
+        """
+        Contexto que descarta los 'print' del sistema cuando la fachada es silenciosa.
+        """
+        if self.silencioso:
+            return contextlib.redirect_stdout(io.StringIO())
+        return contextlib.nullcontext()
+
+    def cargar(self):
+        """
+        Fuerza la carga del catálogo, el menú y el estado local.
+        Devuelve un resumen con la cantidad de objetos cargados.
+        """
+        sistema = self.sistema
+        with self._salida():
+            return {
+                "ingredientes": len(sistema.gestor_ingredientes.ingredientes),
+                "hotdogs": len(sistema.gestor_menu.hotdogs),
+                "inventario": len(sistema.gestor_inventario.inventario.existencias)
+            }
+
+    def simular(self, num_clientes, semilla=None, fecha=None):
+        """
+        Simula un día de ventas y devuelve el reporte (None si no hay menú).
+        Antes de vender se descarta lo vencido antes de 'fecha' (hoy por defecto)
+        y el reporte se agrega al historial en esa fecha.
+        El inventario en memoria queda actualizado; use 'guardar' para persistirlo.
+        """
+        reporte, _ = self._simular(num_clientes, semilla, fecha)
+        return reporte
+
+    def perfilar(self, num_clientes, semilla=None, fecha=None, ruta=None, limite=20):
+        """
+        Igual que 'simular', pero bajo cProfile (ver perfilar_simulacion).
+        Devuelve (reporte, texto_con_las_funciones_mas_costosas).
+        """
+        return self._simular(num_clientes, semilla, fecha, perfil=True, ruta=ruta, limite=limite)
+
+    def _simular(self, num_clientes, semilla, fecha, perfil=False, ruta=None, limite=20):
+        if semilla is not None:
+            random.seed(semilla)
+        fecha = fecha or datetime.date.today()
+        texto_perfil = None
+        with self._salida():
+            simulador = self.sistema.simulador
+            if perfil:
+                reporte, texto_perfil = perfilar_simulacion(simulador, num_clientes, ruta, limite, fecha)
+            else:
+                reporte = simulador.simular_dia(num_clientes, fecha)
+        if reporte:
+            self.sistema.historial.registrar_dia(reporte, fecha)
+        return reporte, texto_perfil
+
+    def reponer(self, cantidades, total=False):
+        """
+        Repone varios ingredientes a la vez a partir de un dict {id: cantidad}.
+        Con total=True la cantidad reemplaza el stock en lugar de sumarse.
+        Devuelve un dict {id: True/False} con el resultado de cada ingrediente.
+        """
+        with self._salida():
+            gestor_inventario = self.sistema.gestor_inventario
+        resultados = {}
+        for id_ing, cantidad in cantidades.items():
+            if total:
+                resultados[id_ing] = gestor_inventario.set_existencia_total(id_ing, cantidad)
+            elif gestor_inventario.gestor_ingredientes.obtener_por_id(id_ing) is None:
+                resultados[id_ing] = False
+            else:
+                resultados[id_ing] = gestor_inventario.agregar_existencia(id_ing, cantidad)
+        return resultados
+
+    def inventario(self, umbral=None):
+        """
+        Devuelve una lista de dicts con el inventario (solo el de bajo stock si se indica 'umbral').
+        """
+        with self._salida():
+            gestor_inventario = self.sistema.gestor_inventario
+        if umbral is None:
+            items = gestor_inventario.obtener_inventario_completo()
+        else:
+            items = gestor_inventario.obtener_inventario_bajo_stock(umbral)
+        return [{"id": ing.id, "categoria": ing.categoria, "cantidad": cantidad} for ing, cantidad in items]
+
+    def exportar_reporte(self, reporte, directorio, formato="png"):
+        """
+        Escribe los gráficos y el resumen de un reporte de simulación en 'directorio'.
+        """
+        with self._salida():
+            return self.sistema.exportar_reporte(reporte, directorio, formato)
+
+    def exportar(self, ruta):
+        """
+        Escribe el menú y el inventario actuales en un archivo JSON.
+        """
+        sistema = self.sistema
+        with self._salida():
+            data = {
+                "inventario": sistema.gestor_inventario.inventario.existencias,
+                "menu": [hd.to_dict() for hd in sistema.gestor_menu.listar_hotdogs()]
+            }
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        return ruta
+
+    def exportar_metricas(self, ruta=None, formato="json"):
+        """
+        Escribe las métricas recogidas. Sin 'ruta' usa los archivos por defecto
+        del sistema (JSON y Prometheus), como al salir del menú interactivo.
+        Devuelve True/False si fue exitoso.
+        """
+        if ruta is None:
+            with self._salida():
+                self.sistema.exportar_metricas()
+            return True
+        return METRICAS.exportar(ruta, formato)
+
+    def guardar(self):
+        """
+        Guarda el inventario y el menú en el archivo de estado local.
+        """
+        with self._salida():
+            self.sistema.guardar_estado()
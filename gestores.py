@@ -1,13 +1,20 @@
+import contextlib
+import copy
 import random
-from modelos import Ingrediente, Inventario, HotDog
+from modelos import Ingrediente, Inventario, HotDog, DiccionarioSuperpuesto
+from metricas import medir
+from eventos import (IngredienteAgregado, IngredienteEliminado, ExistenciaCambiada,
+                     HotDogAgregado, HotDogEliminado)
 
 class GestorIngredientes:
     """
     Módulo de Gestión de Ingredientes.
     Trabaja sobre un dict {id: Ingrediente}.
     """
-    def __init__(self, ingredientes):
+    def __init__(self, ingredientes, bus=None):
         self.ingredientes = ingredientes  
+        self.version = 0  # Cambia con cada alta, baja o cambio de costo.
+        self.bus = bus    # BusEventos opcional donde se publican los cambios.
 
     def listar_por_categoria(self, categoria):
 
@@ -24,11 +31,32 @@ class GestorIngredientes:
     def agregar_ingrediente(self, ingrediente):
 
         self.ingredientes[ingrediente.id] = ingrediente
+        self.version += 1
+        if self.bus is not None:
+            self.bus.publicar(IngredienteAgregado(ingrediente))
 
     def eliminar_ingrediente(self, id_ingrediente):
 
         if id_ingrediente in self.ingredientes:
             del self.ingredientes[id_ingrediente]
+            self.version += 1
+            if self.bus is not None:
+                self.bus.publicar(IngredienteEliminado(id_ingrediente))
+
+    def fijar_costo(self, id_ingrediente, costo):
+        """
+        Cambia el costo unitario de un ingrediente.
+        Devuelve True/False si fue exitoso (False si no existe o el costo es negativo).
+        """
+        ing = self.ingredientes.get(id_ingrediente)
+        if ing is None or costo < 0:
+            return False
+        # Se reemplaza por una copia porque el catálogo puede estar compartido entre sistemas.
+        ing = copy.copy(ing)
+        ing.costo = costo
+        self.ingredientes[id_ingrediente] = ing
+        self.version += 1
+        return True
 
     def obtener_por_id(self, id_ingrediente):
         return self.ingredientes.get(id_ingrediente)
@@ -40,9 +68,11 @@ class GestorInventario:
     """
     Módulo de Gestión de Inventario.
     """
-    def __init__(self, inventario, gestor_ingredientes):
+    def __init__(self, inventario, gestor_ingredientes, bus=None):
         self.inventario = inventario 
         self.gestor_ingredientes = gestor_ingredientes
+        self.bus = bus
+        self._anteriores = None  # {id: existencia al abrir agrupar_eventos}, solo mientras está abierto.
 
     def inicializar_inventario_con_cero(self):
         """
@@ -54,6 +84,56 @@ class GestorInventario:
             if self.inventario.obtener_cantidad(id_ing) == 0 and id_ing not in self.inventario.existencias:
                  self.inventario.set_cantidad(id_ing, 0)
 
+    def inicializar_inventario_con_recomendacion(self, recomendado):
+        """
+        Pre-carga el stock recomendado ({id: cantidad}, ver PronosticadorDemanda)
+        en los ingredientes que están en 0. No sobrescribe existencias ya cargadas.
+        Devuelve la cantidad de ingredientes actualizados.
+        """
+        actualizados = 0
+        with self.agrupar_eventos():
+            for id_ing, cantidad in recomendado.items():
+                if self.gestor_ingredientes.obtener_por_id(id_ing) and self.inventario.obtener_cantidad(id_ing) == 0:
+                    self.inventario.set_cantidad(id_ing, cantidad)
+                    self._publicar_cambio(id_ing, 0)
+                    actualizados += 1
+        return actualizados
+
+    def agrupar_eventos(self):
+        """
+        Contexto que combina los eventos publicados durante una operación masiva
+        (por ejemplo, un día simulado). Sin bus no hace nada.
+        Mientras está abierto solo se anota la existencia inicial de cada ingrediente
+        que cambia; los ExistenciaCambiada se crean al cerrar el bloque más externo.
+        """
+        if self.bus is None:
+            return contextlib.nullcontext()
+        return self._agrupar()
+
+    @contextlib.contextmanager
+    def _agrupar(self):
+        with self.bus.agrupar():
+            externo = self._anteriores is None
+            if externo:
+                self._anteriores = {}
+            try:
+                yield
+            finally:
+                if externo:
+                    anteriores, self._anteriores = self._anteriores, None
+                    for id_ingrediente, anterior in anteriores.items():
+                        self._publicar_cambio(id_ingrediente, anterior)
+
+    def _publicar_cambio(self, id_ingrediente, anterior):
+        if self.bus is None:
+            return
+        if self._anteriores is not None:
+            self._anteriores.setdefault(id_ingrediente, anterior)
+            return
+        nueva = self.inventario.obtener_cantidad(id_ingrediente)
+        if nueva != anterior:
+            self.bus.publicar(ExistenciaCambiada(id_ingrediente, anterior, nueva))
+
     def buscar_existencia(self, id_ingrediente):
         """
         Devuelve la cantidad de un ingrediente.
@@ -65,16 +145,67 @@ class GestorInventario:
         Resta stock de un ingrediente (usado para ventas).
         Devuelve True/False si fue exitoso.
         """
+        if self.bus is None:
+            return self.inventario.restar_cantidad(id_ingrediente, cantidad)
+
+        anteriores = self._anteriores
+        if anteriores is not None:
+            # Camino de cada venta dentro de agrupar_eventos: solo se anota la primera existencia.
+            if id_ingrediente not in anteriores:
+                anteriores[id_ingrediente] = self.inventario.obtener_cantidad(id_ingrediente)
+            return self.inventario.restar_cantidad(id_ingrediente, cantidad)
+
+        anterior = self.inventario.obtener_cantidad(id_ingrediente)
+        exito = self.inventario.restar_cantidad(id_ingrediente, cantidad)
+        self._publicar_cambio(id_ingrediente, anterior)
+        return exito
+
+    def bloquear(self, ids_ingredientes):
+        """
+        Bloquea varios ingredientes para que revisar y restar stock sea atómico
+        (solo tiene efecto con un InventarioConcurrente).
+        """
+        return self.inventario.bloquear(ids_ingredientes)
 
-        return self.inventario.restar_cantidad(id_ingrediente, cantidad)
+    def requiere_bloqueo(self):
+        """
+        Indica si las ventas deben usar 'bloquear' (varios vendedores a la vez).
+        """
+        return self.inventario.requiere_bloqueo
 
+    @medir("inventario.agregar_existencia")
     def agregar_existencia(self, id_ingrediente, cantidad):
         """
         Agrega stock a un ingrediente (usado para reponer).
         """
-
-        return self.inventario.agregar_cantidad(id_ingrediente, cantidad)
+        anterior = self.inventario.obtener_cantidad(id_ingrediente)
+        exito = self.inventario.agregar_cantidad(id_ingrediente, cantidad)
+        self._publicar_cambio(id_ingrediente, anterior)
+        return exito
     
+    def agregar_lote(self, id_ingrediente, cantidad, vencimiento=None):
+        """
+        Agrega un lote con fecha de vencimiento (solo se registra con un InventarioPorLotes).
+        """
+        anterior = self.inventario.obtener_cantidad(id_ingrediente)
+        exito = self.inventario.agregar_lote(id_ingrediente, cantidad, vencimiento)
+        self._publicar_cambio(id_ingrediente, anterior)
+        return exito
+
+    def procesar_vencimientos(self, fecha):
+        """
+        Descarta lo vencido antes de 'fecha'. Devuelve {Ingrediente: cantidad descartada}.
+        """
+        merma = {}
+        with self.agrupar_eventos():
+            for id_ing, cantidad in self.inventario.procesar_vencimientos(fecha).items():
+                self._publicar_cambio(id_ing, self.inventario.obtener_cantidad(id_ing) + cantidad)
+                ing = self.gestor_ingredientes.obtener_por_id(id_ing)
+                if ing:
+                    merma[ing] = cantidad
+        return merma
+
+    @medir("inventario.set_existencia_total")
     def set_existencia_total(self, id_ingrediente, cantidad):
         """
         Establece el stock total de un ingrediente (usado por el admin).
@@ -84,8 +215,12 @@ class GestorInventario:
         if not self.gestor_ingredientes.obtener_por_id(id_ingrediente):
             return False
             
-        return self.inventario.set_cantidad(id_ingrediente, cantidad)
+        anterior = self.inventario.obtener_cantidad(id_ingrediente)
+        exito = self.inventario.set_cantidad(id_ingrediente, cantidad)
+        self._publicar_cambio(id_ingrediente, anterior)
+        return exito
 
+    @medir("inventario.obtener_inventario_completo")
     def obtener_inventario_completo(self):
         """
         Devuelve una lista de tuplas (Ingrediente, cantidad)
@@ -102,6 +237,13 @@ class GestorInventario:
         lista_inventario.sort(key=lambda item: (item[0].categoria, item[0].nombre))
         return lista_inventario
 
+    def bifurcar(self):
+        """
+        Devuelve un GestorInventario sobre una copia en escritura del inventario,
+        para simular escenarios sin modificar el real. Ver Inventario.bifurcar.
+        """
+        return GestorInventario(self.inventario.bifurcar(), self.gestor_ingredientes)
+
     def obtener_inventario_bajo_stock(self, umbral=10):
         """
         Devuelve una lista de (Ingrediente, cantidad) para
@@ -119,10 +261,15 @@ class GestorMenu:
     """
     Módulo de Gestión del Menú de Hot Dogs.
     """
-    def __init__(self, gestor_ingredientes, gestor_inventario):
+    def __init__(self, gestor_ingredientes, gestor_inventario, bus=None):
         self.gestor_ingredientes = gestor_ingredientes
         self.gestor_inventario = gestor_inventario
-        self.hotdogs = {}  
+        self.bus = bus
+        self.hotdogs = {}  # Si se modifica directamente, incremente 'version' para invalidar las cachés.
+        self.version = 0  # Cambia con cada alta, baja, cambio de precio o confirmación de una bifurcación.
+        self._origen = None  # Menú base, si este es una bifurcación.
+        self._cache_recetas = None
+        self._cache_margenes = None
 
     def validar_hotdog(self, hotdog):
         """
@@ -144,6 +291,7 @@ class GestorMenu:
         
         return (True, "Hot dog válido.")
 
+    @medir("menu.agregar_hotdog")
     def agregar_hotdog(self, hotdog):
         """
         Agrega un nuevo hot dog al menú después de validarlo.
@@ -160,6 +308,9 @@ class GestorMenu:
 
        
         self.hotdogs[hotdog.id] = hotdog
+        self.version += 1
+        if self.bus is not None:
+            self.bus.publicar(HotDogAgregado(hotdog))
         return (True, "Hot dog agregado exitosamente.")
 
     def eliminar_hotdog(self, id_hotdog):
@@ -169,22 +320,130 @@ class GestorMenu:
         """
         if id_hotdog in self.hotdogs:
             del self.hotdogs[id_hotdog]
+            self.version += 1
+            if self.bus is not None:
+                self.bus.publicar(HotDogEliminado(id_hotdog))
             return True
         return False
 
+    def fijar_precio(self, id_hotdog, precio):
+        """
+        Cambia el precio de venta de un hot dog.
+        Devuelve True/False si fue exitoso (False si no existe o el precio es negativo).
+        """
+        hd = self.hotdogs.get(id_hotdog)
+        if hd is None or precio < 0:
+            return False
+        # Se reemplaza por una copia porque el menú de la API puede estar compartido entre sistemas.
+        hd = copy.copy(hd)
+        hd.precio = precio
+        self.hotdogs[id_hotdog] = hd
+        self.version += 1
+        return True
+
     def listar_hotdogs(self):
         return list(self.hotdogs.values())
 
     def obtener_hotdog_por_id(self, id_hotdog):
         return self.hotdogs.get(id_hotdog)
 
+    def _clave_cache(self):
+        return (self.version, self.gestor_ingredientes.version)
+
+    def matriz_recetas(self):
+        """
+        Devuelve la matriz de recetas dispersa {id_hotdog: {id_ingrediente: unidades}}.
+        Se recalcula solo cuando cambia el menú.
+        """
+        clave = self.version
+        if self._cache_recetas is None or self._cache_recetas[0] != clave:
+            matriz = {}
+            for hd in self.hotdogs.values():
+                fila = {}
+                for ing, cantidad in hd.receta():
+                    fila[ing.id] = fila.get(ing.id, 0) + cantidad
+                matriz[hd.id] = fila
+            self._cache_recetas = (clave, matriz)
+        return self._cache_recetas[1]
+
+    def _calcular_margenes(self):
+        """
+        Calcula de una vez el costo de todos los hot dogs (matriz de recetas x costos)
+        y el menú ordenado por margen. El resultado queda en caché hasta que cambien
+        los precios, los costos o las recetas.
+        """
+        clave = self._clave_cache()
+        if self._cache_margenes is None or self._cache_margenes[0] != clave:
+            costos_ing = {id_ing: ing.costo for id_ing, ing in self.gestor_ingredientes.ingredientes.items()}
+            costos = {id_hd: sum(unidades * costos_ing.get(id_ing, 0.0) for id_ing, unidades in fila.items())
+                      for id_hd, fila in self.matriz_recetas().items()}
+            por_margen = sorted(((self.hotdogs[id_hd].precio - costo, self.hotdogs[id_hd]) for id_hd, costo in costos.items()),
+                                key=lambda item: item[0], reverse=True)
+            self._cache_margenes = (clave, costos, por_margen)
+        return self._cache_margenes
+
+    def costos_hotdogs(self):
+        """
+        Devuelve {id_hotdog: costo de sus ingredientes}.
+        """
+        return self._calcular_margenes()[1]
+
+    def menu_por_margen(self):
+        """
+        Devuelve una lista de (margen, HotDog) ordenada de mayor a menor margen.
+        """
+        return self._calcular_margenes()[2]
+
+    def bifurcar(self, gestor_inventario=None):
+        """
+        Devuelve un GestorMenu cuyo menú es una copia en escritura de este.
+        Si se pasa un gestor de inventario (por ejemplo, uno bifurcado) se usa ese.
+        """
+        bifurcado = GestorMenu(self.gestor_ingredientes, gestor_inventario or self.gestor_inventario)
+        bifurcado.hotdogs = DiccionarioSuperpuesto(self.hotdogs)
+        bifurcado._origen = self
+        return bifurcado
+
+    def confirmar(self):
+        """
+        Aplica al menú base los cambios de un menú bifurcado y publica en el bus
+        del menú base las altas y bajas resultantes (un reemplazo es baja y alta).
+        """
+        if not isinstance(self.hotdogs, DiccionarioSuperpuesto):
+            raise ValueError("Este menú no es una bifurcación.")
+        base = self.hotdogs.base
+        eliminados = [id_hd for id_hd in self.hotdogs.eliminados if id_hd in base]
+        cambios = list(self.hotdogs.cambios.items())
+        reemplazados = {id_hd for id_hd, _ in cambios if id_hd in base}
+
+        self.hotdogs.confirmar()
+        self._origen.version += 1
+        self.version += 1
+
+        bus = self._origen.bus
+        if bus is not None:
+            for id_hd in eliminados:
+                bus.publicar(HotDogEliminado(id_hd))
+            for id_hd, hd in cambios:
+                if id_hd in reemplazados:
+                    bus.publicar(HotDogEliminado(id_hd))
+                bus.publicar(HotDogAgregado(hd))
+
+    def descartar(self):
+        """
+        Descarta los cambios de un menú bifurcado.
+        """
+        if not isinstance(self.hotdogs, DiccionarioSuperpuesto):
+            raise ValueError("Este menú no es una bifurcación.")
+        self.hotdogs.descartar()
+
     def hay_inventario_para_hotdog(self, hotdog):
         """
-        Revisa si hay al menos 1 unidad de cada ingrediente del hot dog.
+        Revisa si hay la cantidad necesaria de cada ingrediente del hot dog.
         Devuelve (False, Ingrediente_Faltante) si no hay.
         """
-        for ing in hotdog.ingredientes_totales():
-            if self.gestor_inventario.buscar_existencia(ing.id) <= 0:
+        for ing, cantidad in hotdog.receta():
+            if self.gestor_inventario.buscar_existencia(ing.id) < cantidad:
                 
                 return (False, ing) 
         return (True, None) 
@@ -194,16 +453,21 @@ class GestorMenu:
 class SimuladorVentas:
     """
     Módulo de simulación de un día de ventas.
+    Varios simuladores pueden vender a la vez (uno por hilo) si comparten
+    un GestorInventario con un InventarioConcurrente.
     """
     def __init__(self, gestor_menu, gestor_inventario):
         self.gestor_menu = gestor_menu
         self.gestor_inventario = gestor_inventario
         self.estadisticas = {} 
 
-    def simular_dia(self, num_clientes):
+    @medir("simulador.simular_dia")
+    def simular_dia(self, num_clientes, fecha=None):
         """
         Implementa el algoritmo de simulación.
         Recibe el número de clientes (N) y devuelve un reporte.
+        Si se indica 'fecha', antes de vender se descarta lo vencido y
+        el reporte incluye la 'merma' por ingrediente.
         """
 
         self.estadisticas = {
@@ -220,33 +484,126 @@ class SimuladorVentas:
             print("Error de simulación: No hay hot dogs en el menú.")
             return None
 
-        for _ in range(num_clientes):
+        if fecha is not None:
+            merma = self.gestor_inventario.procesar_vencimientos(fecha)
+            self.estadisticas["merma"] = {ing.nombre: cantidad for ing, cantidad in merma.items()}
+
+        # Se decide una vez por día: los inventarios de un solo hilo no pagan los candados.
+        con_bloqueo = self.gestor_inventario.requiere_bloqueo()
+
+        # Los cambios de stock del día se publican combinados al terminar.
+        with self.gestor_inventario.agrupar_eventos():
+            for _ in range(num_clientes):
             
-            hotdog_elegido = random.choice(lista_hotdogs_menu)
-            hd_nombre = hotdog_elegido.nombre
+                hotdog_elegido = random.choice(lista_hotdogs_menu)
+                hd_nombre = hotdog_elegido.nombre
 
-            es_valido, _ = self.gestor_menu.validar_hotdog(hotdog_elegido)
-            if not es_valido:
-                self.estadisticas["ventas_fallidas_validez"] += 1
-                continue 
+                es_valido, _ = self.gestor_menu.validar_hotdog(hotdog_elegido)
+                if not es_valido:
+                    self.estadisticas["ventas_fallidas_validez"] += 1
+                    continue 
 
            
-            hay_stock, ing_faltante = self.gestor_menu.hay_inventario_para_hotdog(hotdog_elegido)
-            
-            if hay_stock:
+                receta = hotdog_elegido.receta()
+                if con_bloqueo:
+                    with self.gestor_inventario.bloquear([ing.id for ing, _ in receta]):
+                        hay_stock, ing_faltante = self.gestor_menu.hay_inventario_para_hotdog(hotdog_elegido)
+                        if hay_stock:
+                            for ing, cantidad in receta:
+                                self.gestor_inventario.restar_existencia(ing.id, cantidad)
+                else:
+                    hay_stock, ing_faltante = self.gestor_menu.hay_inventario_para_hotdog(hotdog_elegido)
                 
-                for ing in hotdog_elegido.ingredientes_totales():
+                    if hay_stock:
                     
-                    self.gestor_inventario.restar_existencia(ing.id, 1) 
-                
-                self.estadisticas["ventas_exitosas"] += 1
-                self.estadisticas["hotdogs_vendidos"][hd_nombre] = self.estadisticas["hotdogs_vendidos"].get(hd_nombre, 0) + 1
+                        for ing, cantidad in receta:
+                        
+                            self.gestor_inventario.restar_existencia(ing.id, cantidad) 
+            
+                if hay_stock:
+                    self.estadisticas["ventas_exitosas"] += 1
+                    self.estadisticas["hotdogs_vendidos"][hd_nombre] = self.estadisticas["hotdogs_vendidos"].get(hd_nombre, 0) + 1
             
-            else:
+                else:
                
-                self.estadisticas["ventas_fallidas_stock"] += 1
+                    self.estadisticas["ventas_fallidas_stock"] += 1
                 
-                if ing_faltante:
-                    self.estadisticas["ingredientes_faltantes"][ing_faltante.nombre] = self.estadisticas["ingredientes_faltantes"].get(ing_faltante.nombre, 0) + 1
+                    if ing_faltante:
+                        self.estadisticas["ingredientes_faltantes"][ing_faltante.nombre] = self.estadisticas["ingredientes_faltantes"].get(ing_faltante.nombre, 0) + 1
 
-        return self.estadisticas
\ No newline at end of file
+        self._calcular_dinero(lista_hotdogs_menu)
+        return self.estadisticas
+
+    def _calcular_dinero(self, lista_hotdogs_menu):
+        """
+        Agrega ingresos, costos y margen al reporte a partir de las unidades vendidas,
+        en una sola pasada al final (no por cada venta).
+        """
+        costos = self.gestor_menu.costos_hotdogs()
+        por_nombre = {hd.nombre: hd for hd in lista_hotdogs_menu}
+
+        ingresos = 0.0
+        costo_total = 0.0
+        for nombre, cantidad in self.estadisticas["hotdogs_vendidos"].items():
+            hd = por_nombre[nombre]
+            ingresos += cantidad * hd.precio
+            costo_total += cantidad * costos.get(hd.id, 0.0)
+
+        self.estadisticas["ingresos"] = ingresos
+        self.estadisticas["costos"] = costo_total
+        self.estadisticas["margen"] = ingresos - costo_total
+
+
+class IndiceDisponibilidad:
+    """
+    Vista derivada que sabe qué hot dogs se pueden preparar con el stock actual.
+    Se calcula completa una vez y luego se actualiza con los eventos del bus:
+    un cambio de stock solo vuelve a revisar los hot dogs que usan ese ingrediente.
+    """
+    def __init__(self, gestor_menu, bus):
+        self.gestor_menu = gestor_menu
+        self.faltantes = {}             # {id_hotdog: Ingrediente faltante o None}
+        self._por_ingrediente = {}      # {id_ingrediente: set(id_hotdog)}
+
+        for hd in gestor_menu.listar_hotdogs():
+            self._indexar(hd)
+
+        bus.suscribir(ExistenciaCambiada, self._al_cambiar_existencia)
+        bus.suscribir(HotDogAgregado, lambda evento: self._indexar(evento.hotdog))
+        bus.suscribir(HotDogEliminado, lambda evento: self._desindexar(evento.id_hotdog))
+
+    def _indexar(self, hotdog):
+        for ing in hotdog.ingredientes_totales():
+            self._por_ingrediente.setdefault(ing.id, set()).add(hotdog.id)
+        self._revisar(hotdog.id)
+
+    def _desindexar(self, id_hotdog):
+        self.faltantes.pop(id_hotdog, None)
+        for ids_hotdogs in self._por_ingrediente.values():
+            ids_hotdogs.discard(id_hotdog)
+
+    def _revisar(self, id_hotdog):
+        hd = self.gestor_menu.obtener_hotdog_por_id(id_hotdog)
+        if hd is None:
+            self.faltantes.pop(id_hotdog, None)
+            return
+        _, ing_faltante = self.gestor_menu.hay_inventario_para_hotdog(hd)
+        self.faltantes[id_hotdog] = ing_faltante
+
+    def _al_cambiar_existencia(self, evento):
+        for id_hotdog in self._por_ingrediente.get(evento.id_ingrediente, ()):
+            self._revisar(id_hotdog)
+
+    def disponibilidad(self, id_hotdog):
+        """
+        Devuelve (True, None) o (False, Ingrediente_Faltante), como hay_inventario_para_hotdog.
+        Un hot dog que el índice no conocía se revisa en ese momento y queda indexado;
+        si no está en el menú devuelve (False, None).
+        """
+        if id_hotdog not in self.faltantes:
+            hd = self.gestor_menu.obtener_hotdog_por_id(id_hotdog)
+            if hd is None:
+                return (False, None)
+            self._indexar(hd)
+        ing_faltante = self.faltantes[id_hotdog]
+        return (ing_faltante is None, ing_faltante)
@@ -0,0 +1,205 @@
+import base64
+import datetime
+import heapq
+import json
+import zlib
+from array import array
+
+
+class HistorialVentas:
+    """
+    Historial de ventas y faltantes por día, solo de agregado (append-only).
+    Los datos se guardan en columnas (arrays de enteros) y se mantienen
+    acumulados por día, semana y mes para responder consultas por rango
+    sin recorrer todos los registros.
+    """
+    COLUMNAS = ("ventas_dia", "ventas_hotdog", "ventas_cantidad",
+                "faltas_dia", "faltas_ingrediente", "faltas_cantidad")
+
+    def __init__(self):
+        self.hotdogs = []
+        self.ingredientes = []
+        self._indice_hotdogs = {}
+        self._indice_ingredientes = {}
+
+        for columna in self.COLUMNAS:
+            setattr(self, columna, array('q'))
+
+        # {familia: {periodo: {clave: {indice: total}}}}
+        self._acumulados = {familia: {"dia": {}, "semana": {}, "mes": {}}
+                            for familia in ("ventas", "faltas", "dias_falta")}
+
+    @staticmethod
+    def _claves_periodo(dia):
+        """
+        Devuelve las claves de día, semana (empieza el lunes) y mes de un ordinal de fecha.
+        """
+        fecha = datetime.date.fromordinal(dia)
+        return {"dia": dia, "semana": (dia - 1) // 7, "mes": fecha.year * 12 + fecha.month - 1}
+
+    @staticmethod
+    def _ordinal(fecha):
+        if fecha is None:
+            fecha = datetime.date.today()
+        return fecha.toordinal()
+
+    def _internar(self, nombre, lista, indice):
+        posicion = indice.get(nombre)
+        if posicion is None:
+            posicion = len(lista)
+            lista.append(nombre)
+            indice[nombre] = posicion
+        return posicion
+
+    def _acumular(self, familia, dia, posicion, cantidad):
+        for periodo, clave in self._claves_periodo(dia).items():
+            totales = self._acumulados[familia][periodo].setdefault(clave, {})
+            totales[posicion] = totales.get(posicion, 0) + cantidad
+
+    def registrar_venta(self, nombre_hotdog, cantidad=1, fecha=None):
+        """
+        Agrega 'cantidad' ventas de un hot dog en 'fecha' (hoy por defecto).
+        """
+        dia = self._ordinal(fecha)
+        posicion = self._internar(nombre_hotdog, self.hotdogs, self._indice_hotdogs)
+        self.ventas_dia.append(dia)
+        self.ventas_hotdog.append(posicion)
+        self.ventas_cantidad.append(cantidad)
+        self._acumular("ventas", dia, posicion, cantidad)
+
+    def registrar_falta(self, nombre_ingrediente, cantidad=1, fecha=None):
+        """
+        Agrega 'cantidad' ventas perdidas por falta de un ingrediente en 'fecha'.
+        """
+        dia = self._ordinal(fecha)
+        posicion = self._internar(nombre_ingrediente, self.ingredientes, self._indice_ingredientes)
+        self.faltas_dia.append(dia)
+        self.faltas_ingrediente.append(posicion)
+        self.faltas_cantidad.append(cantidad)
+
+        primera_del_dia = posicion not in self._acumulados["faltas"]["dia"].get(dia, {})
+        self._acumular("faltas", dia, posicion, cantidad)
+        if primera_del_dia:
+            self._acumular("dias_falta", dia, posicion, 1)
+
+    def registrar_dia(self, reporte, fecha=None):
+        """
+        Agrega un reporte de SimuladorVentas.simular_dia al historial.
+        """
+        for nombre, cantidad in reporte["hotdogs_vendidos"].items():
+            self.registrar_venta(nombre, cantidad, fecha)
+        for nombre, cantidad in reporte["ingredientes_faltantes"].items():
+            self.registrar_falta(nombre, cantidad, fecha)
+
+    def _sumar_rango(self, familia, inicio, fin):
+        """
+        Suma los acumulados de 'familia' entre dos ordinales (inclusive), usando
+        meses y semanas completos cuando caben en el rango y días sueltos en los bordes.
+        """
+        acumulados = self._acumulados[familia]
+        resultado = {}
+
+        def sumar(totales):
+            for posicion, cantidad in totales.items():
+                resultado[posicion] = resultado.get(posicion, 0) + cantidad
+
+        dia = inicio
+        while dia <= fin:
+            fecha = datetime.date.fromordinal(dia)
+            if fecha.day == 1:
+                siguiente_mes = (fecha.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+                if siguiente_mes.toordinal() - 1 <= fin:
+                    sumar(acumulados["mes"].get(fecha.year * 12 + fecha.month - 1, {}))
+                    dia = siguiente_mes.toordinal()
+                    continue
+            if (dia - 1) % 7 == 0 and dia + 6 <= fin:
+                sumar(acumulados["semana"].get((dia - 1) // 7, {}))
+                dia += 7
+                continue
+            sumar(acumulados["dia"].get(dia, {}))
+            dia += 1
+
+        return resultado
+
+    def _rango(self, dias, hasta):
+        fin = self._ordinal(hasta)
+        return fin - dias + 1, fin
+
+    def top_vendidos(self, n=10, dias=90, hasta=None):
+        """
+        Devuelve los 'n' hot dogs más vendidos en los últimos 'dias' días como (nombre, cantidad).
+        """
+        totales = self._sumar_rango("ventas", *self._rango(dias, hasta))
+        mayores = heapq.nlargest(n, totales.items(), key=lambda item: item[1])
+        return [(self.hotdogs[posicion], cantidad) for posicion, cantidad in mayores]
+
+    def frecuencia_faltantes(self, dias=90, hasta=None):
+        """
+        Devuelve {ingrediente: fracción de días con faltante} en los últimos 'dias' días.
+        """
+        totales = self._sumar_rango("dias_falta", *self._rango(dias, hasta))
+        return {self.ingredientes[posicion]: cantidad / dias for posicion, cantidad in totales.items()}
+
+    def serie_diaria(self, inicio, fin):
+        """
+        Devuelve ({nombre_hotdog: [ventas por día]}, numero_de_dias) entre dos fechas (inclusive).
+        """
+        primer_dia, ultimo_dia = inicio.toordinal(), fin.toordinal()
+        num_dias = ultimo_dia - primer_dia + 1
+        series = {nombre: [0] * num_dias for nombre in self.hotdogs}
+        por_dia = self._acumulados["ventas"]["dia"]
+        for dia in range(primer_dia, ultimo_dia + 1):
+            for posicion, cantidad in por_dia.get(dia, {}).items():
+                series[self.hotdogs[posicion]][dia - primer_dia] = cantidad
+        return series, num_dias
+
+    def rango_fechas(self):
+        """
+        Devuelve (primera_fecha, ultima_fecha) con ventas registradas, o None si está vacío.
+        """
+        if not self.ventas_dia:
+            return None
+        return datetime.date.fromordinal(min(self.ventas_dia)), datetime.date.fromordinal(max(self.ventas_dia))
+
+    def guardar(self, ruta):
+        """
+        Guarda el historial en JSON, con cada columna comprimida con zlib.
+        """
+        data = {
+            "hotdogs": self.hotdogs,
+            "ingredientes": self.ingredientes,
+            "columnas": {columna: base64.b64encode(zlib.compress(getattr(self, columna).tobytes())).decode('ascii')
+                         for columna in self.COLUMNAS}
+        }
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except IOError as e:
+            print(f"Error al guardar el historial en '{ruta}': {e}")
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un historial guardado con 'guardar' y recalcula sus acumulados.
+        Si el archivo no existe o está corrupto devuelve un historial vacío.
+        """
+        historial = cls()
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return historial
+        except json.JSONDecodeError:
+            print(f"Error: El archivo '{ruta}' está corrupto. Se usará un historial vacío.")
+            return historial
+
+        columnas = {}
+        for columna in cls.COLUMNAS:
+            columnas[columna] = array('q')
+            columnas[columna].frombytes(zlib.decompress(base64.b64decode(data["columnas"][columna])))
+
+        for dia, posicion, cantidad in zip(columnas["ventas_dia"], columnas["ventas_hotdog"], columnas["ventas_cantidad"]):
+            historial.registrar_venta(data["hotdogs"][posicion], cantidad, datetime.date.fromordinal(dia))
+        for dia, posicion, cantidad in zip(columnas["faltas_dia"], columnas["faltas_ingrediente"], columnas["faltas_cantidad"]):
+            historial.registrar_falta(data["ingredientes"][posicion], cantidad, datetime.date.fromordinal(dia))
+        return historial
@@ -1,14 +1,10 @@
+import sys
+import cli
 from sistema import SistemaHotDog
 
 if __name__ == "__main__":
-    USERNAME = "FernandoSapient"
-    REPOSITORY = "BPTSP05_2526-1"
-    BRANCH = "main"
-    MENU_PATH = "menu.json"
-    ING_PATH = "ingredientes.json"
+    if len(sys.argv) > 1:
+        sys.exit(cli.main(sys.argv[1:]))
 
-    MENU_URL = f"https://raw.githubusercontent.com/{USERNAME}/{REPOSITORY}/{BRANCH}/{MENU_PATH}"
-    ING_URL = f"https://raw.githubusercontent.com/{USERNAME}/{REPOSITORY}/{BRANCH}/{ING_PATH}"
-
-    sistema = SistemaHotDog(MENU_URL, ING_URL)
-    sistema.ejecutar()
+    sistema = SistemaHotDog(cli.MENU_URL, cli.ING_URL)
+    sistema.ejecutar()
\ No newline at end of file
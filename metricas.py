@@ -0,0 +1,162 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+
+class Metricas:
+    """
+    Registro opcional de métricas por operación (contadores e histogramas de latencia).
+    Mientras está desactivado, las funciones decoradas con 'medir' solo pagan
+    una comprobación de un booleano. Por eso no se decoran las operaciones que
+    se llaman por cada venta (validar, revisar y restar stock): su costo queda
+    dentro de 'simulador.simular_dia'.
+    Es seguro registrar desde varios hilos.
+    """
+    # Límites superiores (en segundos) de los cubos del histograma.
+    LIMITES = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+    def __init__(self):
+        self.activo = False
+        self.operaciones = {}
+        self._candado = threading.Lock()
+
+    def activar(self):
+        self.activo = True
+
+    def desactivar(self):
+        self.activo = False
+
+    def reiniciar(self):
+        with self._candado:
+            self.operaciones = {}
+
+    def _copia(self):
+        with self._candado:
+            return {operacion: dict(datos, cubos=list(datos["cubos"]))
+                    for operacion, datos in self.operaciones.items()}
+
+    def registrar(self, operacion, duracion):
+        """
+        Suma una llamada de 'operacion' que tardó 'duracion' segundos.
+        """
+        posicion = len(self.LIMITES)
+        for i, limite in enumerate(self.LIMITES):
+            if duracion <= limite:
+                posicion = i
+                break
+
+        with self._candado:
+            datos = self.operaciones.get(operacion)
+            if datos is None:
+                datos = {"llamadas": 0, "total": 0.0, "cubos": [0] * (len(self.LIMITES) + 1)}
+                self.operaciones[operacion] = datos
+
+            datos["llamadas"] += 1
+            datos["total"] += duracion
+            datos["cubos"][posicion] += 1
+
+    def a_dict(self):
+        """
+        Devuelve las métricas como un diccionario serializable a JSON.
+        """
+        resultado = {}
+        for operacion, datos in self._copia().items():
+            histograma = {}
+            for limite, cantidad in zip(list(self.LIMITES) + ["+Inf"], datos["cubos"]):
+                histograma[str(limite)] = cantidad
+            resultado[operacion] = {
+                "llamadas": datos["llamadas"],
+                "total_segundos": datos["total"],
+                "histograma": histograma
+            }
+        return resultado
+
+    def a_prometheus(self):
+        """
+        Devuelve las métricas en el formato de texto de Prometheus.
+        """
+        lineas = [
+            "# HELP hotdog_operacion_segundos Latencia de las operaciones del sistema.",
+            "# TYPE hotdog_operacion_segundos histogram"
+        ]
+        for operacion, datos in sorted(self._copia().items()):
+            acumulado = 0
+            for limite, cantidad in zip(list(self.LIMITES) + ["+Inf"], datos["cubos"]):
+                acumulado += cantidad
+                lineas.append(f'hotdog_operacion_segundos_bucket{{operacion="{operacion}",le="{limite}"}} {acumulado}')
+            lineas.append(f'hotdog_operacion_segundos_sum{{operacion="{operacion}"}} {datos["total"]}')
+            lineas.append(f'hotdog_operacion_segundos_count{{operacion="{operacion}"}} {datos["llamadas"]}')
+        return "\n".join(lineas) + "\n"
+
+    def exportar(self, ruta, formato="json"):
+        """
+        Escribe las métricas en un archivo local ('json' o 'prometheus').
+        El archivo de Prometheus sirve para el 'textfile collector' de node_exporter.
+        Devuelve True/False si fue exitoso.
+        """
+        if formato == "json":
+            contenido = json.dumps(self.a_dict(), indent=4, ensure_ascii=False)
+        elif formato == "prometheus":
+            contenido = self.a_prometheus()
+        else:
+            print(f"Error: Formato de métricas desconocido '{formato}'.")
+            return False
+
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(contenido)
+        except IOError as e:
+            print(f"Error al exportar las métricas a '{ruta}': {e}")
+            return False
+        return True
+
+
+# Instancia compartida por todos los módulos.
+# Se activa con la variable de entorno HOTDOG_METRICAS=1.
+METRICAS = Metricas()
+if os.environ.get("HOTDOG_METRICAS") == "1":
+    METRICAS.activar()
+
+
+def medir(operacion):
+    """
+    Decorador que registra la latencia de la función en METRICAS cuando está activo.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not METRICAS.activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                METRICAS.registrar(operacion, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+def perfilar_simulacion(simulador, num_clientes, ruta=None, limite=20, fecha=None):
+    """
+    Ejecuta 'simulador.simular_dia' (con 'fecha', si se indica) bajo cProfile.
+    Devuelve (reporte, texto_con_las_funciones_mas_costosas).
+    Si se indica 'ruta', también guarda las estadísticas crudas (para snakeviz, pstats, etc.).
+    """
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        reporte = simulador.simular_dia(num_clientes, fecha)
+    finally:
+        perfil.disable()
+
+    if ruta:
+        perfil.dump_stats(ruta)
+
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(limite)
+    return reporte, salida.getvalue()
@@ -1,13 +1,44 @@
+import bisect
+import contextlib
+import datetime
+import hashlib
+import heapq
+import json
+import threading
+from collections.abc import MutableMapping
+
+
+def huella_receta(pan, salchicha, toppings, salsas, acompanante, cantidades, precio):
+    """
+    Calcula la huella (hash) de una receta a partir de los IDs de sus componentes.
+    El orden de toppings y salsas no importa, y las cantidades iguales a 1 se omiten.
+    Dos recetas con la misma huella son el mismo hot dog aunque vengan de fuentes distintas.
+    """
+    canonica = {
+        "Pan": pan,
+        "Salchicha": salchicha,
+        "toppings": sorted(toppings),
+        "salsas": sorted(salsas),
+        "Acompañante": acompanante,
+        "cantidades": {id_ing: cantidad for id_ing, cantidad in cantidades.items() if cantidad != 1},
+        "precio": precio
+    }
+    texto = json.dumps(canonica, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
 class Ingrediente:
     """
     Representa un ingrediente (pan, salchicha, topping, salsa, acompañante, etc.).
     """
-    def __init__(self, id_, nombre, categoria, tipo, longitud=None):
+    def __init__(self, id_, nombre, categoria, tipo, longitud=None, costo=0.0, unidad="unidad"):
         self.id = id_
         self.nombre = nombre
         self.categoria = categoria  
         self.tipo = tipo            
         self.longitud = longitud     
+        self.costo = costo           
+        self.unidad = unidad         # Unidad base en la que se cuenta su stock.
 
     def __str__(self):
         return f"{self.nombre} ({self.categoria}, {self.tipo})"
@@ -17,7 +48,7 @@ class HotDog:
     """
     Representa un hot dog del menú.
     """
-    def __init__(self, id_, nombre, pan, salchicha, toppings, salsas, acompanante=None):
+    def __init__(self, id_, nombre, pan, salchicha, toppings, salsas, acompanante=None, precio=0.0, cantidades=None):
         self.id = id_
         self.nombre = nombre
         self.pan = pan                  
@@ -25,6 +56,9 @@ class HotDog:
         self.toppings = toppings or []  
         self.salsas = salsas or []     
         self.acompanante = acompanante  
+        self.precio = precio            
+        self.cantidades = cantidades or {}  # {id_ingrediente: cantidad en unidad base}, 1 si no aparece.
+        self._receta = None
 
     def ingredientes_totales(self):
         """
@@ -35,6 +69,26 @@ class HotDog:
             ingredientes.append(self.acompanante)
         return ingredientes
 
+    def huella(self):
+        """
+        Devuelve la huella de la receta (ver huella_receta). No incluye el nombre.
+        """
+        return huella_receta(self.pan.id, self.salchicha.id, [t.id for t in self.toppings],
+                             [s.id for s in self.salsas], self.acompanante.id if self.acompanante else None,
+                             self.cantidades, self.precio)
+
+    def cantidad_de(self, id_ingrediente):
+        return self.cantidades.get(id_ingrediente, 1)
+
+    def receta(self):
+        """
+        Devuelve una lista de (Ingrediente, cantidad) en el mismo orden que ingredientes_totales.
+        Se calcula una sola vez; no modifique los ingredientes después de usarla.
+        """
+        if self._receta is None:
+            self._receta = [(ing, self.cantidad_de(ing.id)) for ing in self.ingredientes_totales()]
+        return self._receta
+
     def __str__(self):
         return f"HotDog #{self.id}: {self.nombre}"
 
@@ -49,14 +103,84 @@ class HotDog:
             "Salchicha": self.salchicha.id,
             "toppings": [t.id for t in self.toppings],
             "salsas": [s.id for s in self.salsas],
-            "Acompañante": self.acompanante.id if self.acompanante else None
+            "Acompañante": self.acompanante.id if self.acompanante else None,
+            "precio": self.precio,
+            "cantidades": self.cantidades
         }
 
 
+class DiccionarioSuperpuesto(MutableMapping):
+    """
+    Dict de copia en escritura sobre un dict base: las lecturas caen al base y
+    las escrituras/borrados se guardan aparte, sin tocar ni copiar el base.
+    Los cambios se pueden confirmar (aplicar al base) o descartar.
+    """
+    def __init__(self, base):
+        self.base = base
+        self.cambios = {}
+        self.eliminados = set()
+
+    def __getitem__(self, clave):
+        if clave in self.cambios:
+            return self.cambios[clave]
+        if clave in self.eliminados:
+            raise KeyError(clave)
+        return self.base[clave]
+
+    def get(self, clave, defecto=None):
+        if clave in self.cambios:
+            return self.cambios[clave]
+        if clave in self.eliminados:
+            return defecto
+        return self.base.get(clave, defecto)
+
+    def __setitem__(self, clave, valor):
+        self.cambios[clave] = valor
+        self.eliminados.discard(clave)
+
+    def __delitem__(self, clave):
+        if clave not in self:
+            raise KeyError(clave)
+        self.cambios.pop(clave, None)
+        if clave in self.base:
+            self.eliminados.add(clave)
+
+    def __contains__(self, clave):
+        if clave in self.cambios:
+            return True
+        return clave not in self.eliminados and clave in self.base
+
+    def __iter__(self):
+        for clave in self.base:
+            if clave not in self.eliminados and clave not in self.cambios:
+                yield clave
+        yield from self.cambios
+
+    def __len__(self):
+        nuevas = sum(1 for clave in self.cambios if clave not in self.base)
+        return len(self.base) - len(self.eliminados) + nuevas
+
+    def confirmar(self):
+        """
+        Aplica los cambios al dict base y deja la superposición vacía.
+        """
+        for clave in self.eliminados:
+            self.base.pop(clave, None)
+        self.base.update(self.cambios)
+        self.descartar()
+
+    def descartar(self):
+        self.cambios = {}
+        self.eliminados = set()
+
+
 class Inventario:
     """
     Maneja las existencias de ingredientes (por id de ingrediente).
     """
+    # Si las ventas deben tomar candados con 'bloquear' (solo InventarioConcurrente).
+    requiere_bloqueo = False
+
     def __init__(self):
         
         self.existencias = {}
@@ -96,4 +220,300 @@ class Inventario:
             
         cantidad_actual = self.obtener_cantidad(id_ingrediente)
         self.existencias[id_ingrediente] = cantidad_actual + cantidad_a_agregar
-        return True
\ No newline at end of file
+        return True
+
+    def agregar_lote(self, id_ingrediente, cantidad_a_agregar, vencimiento=None):
+        """
+        Agrega un lote con fecha de vencimiento. El inventario simple no
+        maneja lotes, así que la fecha se ignora.
+        """
+        return self.agregar_cantidad(id_ingrediente, cantidad_a_agregar)
+
+    def procesar_vencimientos(self, fecha):
+        """
+        Descarta lo vencido antes de 'fecha' y devuelve {id: cantidad descartada}.
+        El inventario simple no maneja vencimientos.
+        """
+        return {}
+
+    def bloquear(self, ids_ingredientes):
+        """
+        Contexto para hacer atómica una operación sobre varios ingredientes.
+        El inventario simple no es seguro entre hilos, así que no bloquea nada.
+        """
+        return contextlib.nullcontext()
+
+    def bifurcar(self):
+        """
+        Devuelve una copia en escritura de este inventario para probar escenarios.
+        Solo guarda las diferencias; mientras exista no se debe modificar el inventario base.
+        """
+        return InventarioBifurcado(self)
+
+
+class InventarioBifurcado(Inventario):
+    """
+    Inventario que guarda solo sus diferencias respecto a un inventario base.
+    """
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+        self.existencias = DiccionarioSuperpuesto(base.existencias)
+
+    def confirmar(self):
+        """
+        Aplica las diferencias al inventario base (a través de sus propios métodos,
+        por si es un InventarioConcurrente o un InventarioPorLotes, que conserva
+        sus lotes) y deja la bifurcación vacía.
+        """
+        for id_ingrediente, cantidad in self.existencias.cambios.items():
+            self.base.set_cantidad(id_ingrediente, cantidad)
+        self.existencias.descartar()
+
+    def descartar(self):
+        self.existencias.descartar()
+
+
+class InventarioConcurrente(Inventario):
+    """
+    Inventario seguro para varios hilos (varios vendedores a la vez).
+    En lugar de un candado global usa un grupo fijo de candados repartidos
+    por ingrediente, así que ventas de ingredientes distintos no se esperan.
+    """
+    requiere_bloqueo = True
+
+    def __init__(self, num_candados=64):
+        super().__init__()
+        self._candados = [threading.RLock() for _ in range(num_candados)]
+
+    def _candado(self, id_ingrediente):
+        return self._candados[hash(id_ingrediente) % len(self._candados)]
+
+    def set_cantidad(self, id_ingrediente, cantidad):
+        with self._candado(id_ingrediente):
+            return super().set_cantidad(id_ingrediente, cantidad)
+
+    def restar_cantidad(self, id_ingrediente, cantidad_a_restar):
+        with self._candado(id_ingrediente):
+            return super().restar_cantidad(id_ingrediente, cantidad_a_restar)
+
+    def agregar_cantidad(self, id_ingrediente, cantidad_a_agregar):
+        with self._candado(id_ingrediente):
+            return super().agregar_cantidad(id_ingrediente, cantidad_a_agregar)
+
+    @contextlib.contextmanager
+    def bloquear(self, ids_ingredientes):
+        """
+        Toma los candados de todos los ingredientes, siempre en el mismo orden
+        (por índice de candado) para que dos ventas no puedan bloquearse mutuamente.
+        """
+        indices = sorted({hash(id_ing) % len(self._candados) for id_ing in ids_ingredientes})
+        for i in indices:
+            self._candados[i].acquire()
+        try:
+            yield
+        finally:
+            for i in reversed(indices):
+                self._candados[i].release()
+
+
+class InventarioPorLotes(Inventario):
+    """
+    Inventario con lotes perecederos. Cada ingrediente tiene sus lotes
+    ordenados por vencimiento y las ventas consumen primero lo que vence
+    antes (FEFO; a igual fecha, el lote más antiguo). 'existencias' sigue
+    guardando el total de cada ingrediente, así que consultar es O(1).
+    El stock que no está en ningún lote (por ejemplo, el cargado con
+    set_cantidad) se trata como un lote sin vencimiento.
+    """
+    def __init__(self):
+        super().__init__()
+        self.lotes = {}           # {id: [[clave_orden, secuencia, cantidad, vencimiento], ...]}
+        self._vencimientos = []   # heap de (vencimiento, id)
+        self._secuencia = 0
+
+    def agregar_lote(self, id_ingrediente, cantidad_a_agregar, vencimiento=None):
+        if cantidad_a_agregar < 0:
+            return False
+        if vencimiento is None:
+            return super().agregar_cantidad(id_ingrediente, cantidad_a_agregar)
+
+        self._secuencia += 1
+        lote = [vencimiento.toordinal(), self._secuencia, cantidad_a_agregar, vencimiento]
+        bisect.insort(self.lotes.setdefault(id_ingrediente, []), lote)
+        heapq.heappush(self._vencimientos, (vencimiento, id_ingrediente))
+        return super().agregar_cantidad(id_ingrediente, cantidad_a_agregar)
+
+    def set_cantidad(self, id_ingrediente, cantidad):
+        """
+        Establece el total sin perder los lotes: si baja, la diferencia se
+        consume de los lotes como una venta (FEFO); si sube, se agrega como
+        stock sin vencimiento.
+        """
+        if cantidad < 0:
+            cantidad = 0
+        faltante = self.existencias.get(id_ingrediente, 0) - cantidad
+        lotes = self.lotes.get(id_ingrediente)
+        if faltante > 0 and lotes:
+            self._consumir_lotes(lotes, faltante)
+        self.existencias[id_ingrediente] = cantidad
+        return True
+
+    @staticmethod
+    def _consumir_lotes(lotes, cantidad):
+        """
+        Consume 'cantidad' de los lotes en orden FEFO y quita los que quedan vacíos.
+        Si los lotes no alcanzan, el resto sale del stock sin vencimiento.
+        """
+        consumidos = 0
+        pendiente = cantidad
+        for lote in lotes:
+            if pendiente <= 0:
+                break
+            usado = min(lote[2], pendiente)
+            lote[2] -= usado
+            pendiente -= usado
+            if lote[2] == 0:
+                consumidos += 1
+        del lotes[:consumidos]
+
+    def restar_cantidad(self, id_ingrediente, cantidad_a_restar):
+        # Mismo camino que Inventario.restar_cantidad, escrito en línea porque es el de cada venta.
+        cantidad_actual = self.existencias.get(id_ingrediente, 0)
+        if cantidad_actual < cantidad_a_restar:
+            return False
+        self.existencias[id_ingrediente] = cantidad_actual - cantidad_a_restar
+
+        lotes = self.lotes.get(id_ingrediente)
+        if lotes:
+            self._consumir_lotes(lotes, cantidad_a_restar)
+        return True
+
+    def procesar_vencimientos(self, fecha):
+        """
+        Descarta todos los lotes que vencieron antes de 'fecha' (pensado para
+        llamarse una vez al empezar cada día) y devuelve {id: cantidad descartada}.
+        """
+        merma = {}
+        afectados = set()
+        while self._vencimientos and self._vencimientos[0][0] < fecha:
+            afectados.add(heapq.heappop(self._vencimientos)[1])
+
+        limite = fecha.toordinal()
+        for id_ing in afectados:
+            lotes = self.lotes.get(id_ing, [])
+            vencidos = 0
+            descartado = 0
+            while vencidos < len(lotes) and lotes[vencidos][0] < limite:
+                descartado += lotes[vencidos][2]
+                vencidos += 1
+            if not vencidos:
+                continue
+            del lotes[:vencidos]
+
+            self.existencias[id_ing] = max(0, self.obtener_cantidad(id_ing) - descartado)
+            if descartado:
+                merma[id_ing] = descartado
+        return merma
+
+    def bifurcar(self):
+        """
+        Devuelve una copia en escritura que también maneja lotes (ver InventarioPorLotesBifurcado).
+        """
+        return InventarioPorLotesBifurcado(self)
+
+    def exportar_lotes(self):
+        """
+        Devuelve los lotes como {id: [[cantidad, "AAAA-MM-DD"], ...]} (serializable a JSON).
+        """
+        return {id_ing: [[lote[2], lote[3].isoformat()] for lote in lotes]
+                for id_ing, lotes in self.lotes.items() if lotes}
+
+    def restaurar_lotes(self, lotes_serializados):
+        """
+        Vuelve a crear los lotes guardados con exportar_lotes sin cambiar los totales,
+        que ya deben estar cargados en 'existencias'.
+        """
+        for id_ing, lotes in lotes_serializados.items():
+            for cantidad, vencimiento in lotes:
+                vencimiento = datetime.date.fromisoformat(vencimiento)
+                self._secuencia += 1
+                bisect.insort(self.lotes.setdefault(id_ing, []),
+                              [vencimiento.toordinal(), self._secuencia, cantidad, vencimiento])
+                heapq.heappush(self._vencimientos, (vencimiento, id_ing))
+
+
+class InventarioPorLotesBifurcado(InventarioPorLotes):
+    """
+    Bifurcación de un InventarioPorLotes. Las existencias y los lotes se guardan
+    en copia en escritura: los lotes de un ingrediente se copian la primera vez
+    que la bifurcación los modifica, así que las ventas consumen en orden FEFO,
+    los lotes agregados conservan su vencimiento y procesar_vencimientos descarta
+    lo vencido, igual que en el inventario real, sin tocar el base.
+    """
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+        self.existencias = DiccionarioSuperpuesto(base.existencias)
+        self.lotes = DiccionarioSuperpuesto(base.lotes)
+        self._secuencia = base._secuencia
+
+    def _lotes_propios(self, id_ingrediente):
+        """
+        Devuelve la copia propia de los lotes del ingrediente, creándola si hace falta.
+        """
+        propios = self.lotes.cambios.get(id_ingrediente)
+        if propios is None:
+            propios = [list(lote) for lote in self.base.lotes.get(id_ingrediente, [])]
+            self.lotes[id_ingrediente] = propios
+        return propios
+
+    def agregar_lote(self, id_ingrediente, cantidad_a_agregar, vencimiento=None):
+        if vencimiento is not None:
+            self._lotes_propios(id_ingrediente)
+        return super().agregar_lote(id_ingrediente, cantidad_a_agregar, vencimiento)
+
+    def set_cantidad(self, id_ingrediente, cantidad):
+        if id_ingrediente in self.base.lotes:
+            self._lotes_propios(id_ingrediente)
+        return super().set_cantidad(id_ingrediente, cantidad)
+
+    def restar_cantidad(self, id_ingrediente, cantidad_a_restar):
+        if id_ingrediente not in self.lotes.cambios and id_ingrediente in self.base.lotes:
+            self._lotes_propios(id_ingrediente)
+        return super().restar_cantidad(id_ingrediente, cantidad_a_restar)
+
+    def procesar_vencimientos(self, fecha):
+        # El heap de vencimientos es del base; aquí se revisa el primer lote de cada ingrediente.
+        limite = fecha.toordinal()
+        for id_ing in list(self.lotes):
+            lotes = self.lotes[id_ing]
+            if lotes and lotes[0][0] < limite:
+                heapq.heappush(self._vencimientos, (lotes[0][3], id_ing))
+                self._lotes_propios(id_ing)
+        return super().procesar_vencimientos(fecha)
+
+    def confirmar(self):
+        """
+        Aplica las diferencias (existencias y lotes) al inventario base y deja la bifurcación vacía.
+        """
+        base = self.base
+        for id_ing, lotes in self.lotes.cambios.items():
+            base.lotes[id_ing] = lotes
+            for lote in lotes:
+                heapq.heappush(base._vencimientos, (lote[3], id_ing))
+        base._secuencia = max(base._secuencia, self._secuencia)
+
+        for id_ing, cantidad in self.existencias.cambios.items():
+            if id_ing in self.lotes.cambios:
+                # Los lotes ya quedaron como en la bifurcación; solo falta el total.
+                base.existencias[id_ing] = cantidad
+            else:
+                base.set_cantidad(id_ing, cantidad)
+        self.descartar()
+
+    def descartar(self):
+        self.existencias.descartar()
+        self.lotes.descartar()
+        self._vencimientos = []
+        self._secuencia = self.base._secuencia
\ No newline at end of file
@@ -0,0 +1,99 @@
+import math
+import numpy as np
+
+
+class PronosticadorDemanda:
+    """
+    Pronostica la demanda diaria de cada hot dog a partir del historial de ventas
+    con suavizado exponencial (opcionalmente con estacionalidad semanal aditiva),
+    y la traduce a ingredientes con la matriz de recetas del menú.
+    Todos los hot dogs se ajustan a la vez sobre una matriz de numpy
+    (hot dogs x días): el recorrido es día por día, pero cada paso actualiza
+    todos los hot dogs con operaciones vectoriales.
+    """
+    def __init__(self, alfa=0.3, gamma=0.1, periodo=7, estacional=True):
+        self.alfa = alfa
+        self.gamma = gamma
+        self.periodo = periodo
+        self.estacional = estacional
+
+        self.nombres = []
+        self.niveles = np.zeros(0)
+        self.estaciones = np.zeros((0, periodo))
+        self._dia_siguiente = 0
+
+    def ajustar(self, historial, inicio=None, fin=None):
+        """
+        Ajusta el modelo con las ventas diarias del historial entre 'inicio' y 'fin'
+        (por defecto, todo el historial). Devuelve self.
+        """
+        if inicio is None or fin is None:
+            rango = historial.rango_fechas()
+            if rango is None:
+                self.nombres = []
+                self.niveles = np.zeros(0)
+                self.estaciones = np.zeros((0, self.periodo))
+                return self
+            inicio = inicio or rango[0]
+            fin = fin or rango[1]
+
+        series, num_dias = historial.serie_diaria(inicio, fin)
+        self.nombres = list(series)
+        ventas = np.array([series[nombre] for nombre in self.nombres], dtype=float).reshape(len(self.nombres), num_dias)
+
+        # Se arranca con la media del primer período como nivel y estaciones en cero.
+        arranque = min(self.periodo, num_dias)
+        niveles = ventas[:, :arranque].mean(axis=1)
+        estaciones = np.zeros((len(self.nombres), self.periodo))
+
+        alfa, gamma, periodo = self.alfa, self.gamma, self.periodo
+        if self.estacional:
+            for dia in range(num_dias):
+                fase = dia % periodo
+                observados = ventas[:, dia]
+                estacion_dia = estaciones[:, fase]
+                niveles = alfa * (observados - estacion_dia) + (1 - alfa) * niveles
+                estaciones[:, fase] = gamma * (observados - niveles) + (1 - gamma) * estacion_dia
+        else:
+            # Sin estacionalidad el nivel final tiene forma cerrada: una media
+            # ponderada exponencialmente de los días, calculada como un producto matriz-vector.
+            pesos = alfa * (1 - alfa) ** np.arange(num_dias - 1, -1, -1)
+            niveles = (1 - alfa) ** num_dias * niveles + ventas @ pesos
+
+        self.niveles = niveles
+        self.estaciones = estaciones
+        self._dia_siguiente = num_dias
+        return self
+
+    def pronosticar(self, dias=1):
+        """
+        Devuelve {nombre_hotdog: demanda total esperada en los próximos 'dias' días}.
+        """
+        fases = (self._dia_siguiente + np.arange(dias)) % self.periodo
+        estacion = self.estaciones[:, fases] if self.estacional else np.zeros((len(self.nombres), dias))
+        diarios = self.niveles[:, None] + estacion
+        totales = np.maximum(diarios, 0.0).sum(axis=1)
+        return {nombre: float(total) for nombre, total in zip(self.nombres, totales)}
+
+    def demanda_ingredientes(self, gestor_menu, dias=1):
+        """
+        Proyecta el pronóstico por hot dog a {id_ingrediente: unidades} con la matriz de recetas.
+        """
+        pronostico = self.pronosticar(dias)
+        matriz = gestor_menu.matriz_recetas()
+        demanda = {}
+        for hd in gestor_menu.listar_hotdogs():
+            cantidad_hd = pronostico.get(hd.nombre, 0.0)
+            if not cantidad_hd:
+                continue
+            for id_ing, unidades in matriz[hd.id].items():
+                demanda[id_ing] = demanda.get(id_ing, 0.0) + cantidad_hd * unidades
+        return demanda
+
+    def recomendar_stock(self, gestor_menu, dias=1, margen=0.2):
+        """
+        Devuelve {id_ingrediente: stock inicial recomendado} (entero, redondeado hacia arriba)
+        para cubrir 'dias' días de demanda más un 'margen' de seguridad.
+        """
+        return {id_ing: math.ceil(cantidad * (1 + margen))
+                for id_ing, cantidad in self.demanda_ingredientes(gestor_menu, dias).items()}
@@ -0,0 +1,107 @@
+import heapq
+import json
+import os
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def agrupar_top_k(datos, k=10, etiqueta_otros="Otros"):
+    """
+    Reduce un dict {nombre: cantidad} a las 'k' entradas más grandes
+    más una entrada 'Otros' con la suma del resto.
+    Devuelve una lista de tuplas (nombre, cantidad) ordenada de mayor a menor.
+    """
+    if len(datos) <= k:
+        return sorted(datos.items(), key=lambda item: item[1], reverse=True)
+
+    mayores = heapq.nlargest(k, datos.items(), key=lambda item: item[1])
+    resto = sum(datos.values()) - sum(cantidad for _, cantidad in mayores)
+    if resto > 0:
+        mayores.append((etiqueta_otros, resto))
+    return mayores
+
+
+class GeneradorReportes:
+    """
+    Genera los gráficos y el resumen de una simulación sin interfaz gráfica.
+    Las figuras se crean una sola vez y se reutilizan entre reportes.
+    """
+    FORMATOS = ("png", "svg")
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self._figuras = {}
+
+    def _obtener_figura(self, clave):
+        figura = self._figuras.get(clave)
+        if figura is None:
+            figura = Figure(figsize=(10, 6))
+            FigureCanvasAgg(figura)
+            self._figuras[clave] = figura
+        else:
+            figura.clf()
+        return figura
+
+    def _dibujar_barras(self, clave, datos, titulo, etiqueta_x, etiqueta_y, color):
+        agrupados = agrupar_top_k(datos, self.top_k)
+        figura = self._obtener_figura(clave)
+        ejes = figura.add_subplot()
+        ejes.bar([nombre for nombre, _ in agrupados], [cantidad for _, cantidad in agrupados], color=color)
+        ejes.set_title(titulo)
+        ejes.set_ylabel(etiqueta_y)
+        ejes.set_xlabel(etiqueta_x)
+        ejes.tick_params(axis='x', labelrotation=45)
+        for etiqueta in ejes.get_xticklabels():
+            etiqueta.set_horizontalalignment('right')
+        figura.tight_layout()
+        return figura
+
+    def resumen(self, reporte):
+        """
+        Devuelve un resumen del reporte serializable a JSON, con los top-K ya agrupados.
+        """
+        return {
+            "ventas_exitosas": reporte["ventas_exitosas"],
+            "ventas_fallidas_stock": reporte["ventas_fallidas_stock"],
+            "ventas_fallidas_validez": reporte["ventas_fallidas_validez"],
+            "ingresos": reporte.get("ingresos", 0.0),
+            "costos": reporte.get("costos", 0.0),
+            "margen": reporte.get("margen", 0.0),
+            "hotdogs_distintos_vendidos": len(reporte["hotdogs_vendidos"]),
+            "ingredientes_distintos_faltantes": len(reporte["ingredientes_faltantes"]),
+            "top_hotdogs_vendidos": agrupar_top_k(reporte["hotdogs_vendidos"], self.top_k),
+            "top_ingredientes_faltantes": agrupar_top_k(reporte["ingredientes_faltantes"], self.top_k)
+        }
+
+    def exportar(self, reporte, directorio, formato="png", prefijo="reporte"):
+        """
+        Escribe en 'directorio' los gráficos del reporte y un resumen en JSON.
+        Devuelve la lista de rutas escritas.
+        """
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de gráfico no soportado: '{formato}'.")
+
+        os.makedirs(directorio, exist_ok=True)
+        rutas = []
+
+        if reporte["hotdogs_vendidos"]:
+            figura = self._dibujar_barras("ventas", reporte["hotdogs_vendidos"], 'Hot Dogs Más Vendidos',
+                                          'Nombre del Hot Dog', 'Cantidad Vendida', 'green')
+            ruta = os.path.join(directorio, f"{prefijo}_ventas.{formato}")
+            figura.savefig(ruta, format=formato)
+            rutas.append(ruta)
+
+        if reporte["ingredientes_faltantes"]:
+            figura = self._dibujar_barras("faltantes", reporte["ingredientes_faltantes"],
+                                          'Ingredientes Faltantes (Oportunidades Perdidas)',
+                                          'Nombre del Ingrediente', 'Veces que Faltó', 'red')
+            ruta = os.path.join(directorio, f"{prefijo}_faltantes.{formato}")
+            figura.savefig(ruta, format=formato)
+            rutas.append(ruta)
+
+        ruta = os.path.join(directorio, f"{prefijo}_resumen.json")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.resumen(reporte), f, indent=4, ensure_ascii=False)
+        rutas.append(ruta)
+
+        return rutas
@@ -1,102 +1,209 @@
+import datetime
 import json
 import matplotlib.pyplot as plt
-from modelos import Inventario, HotDog
+from modelos import InventarioPorLotes, HotDog
 from cargador_datos import CargadorDatos
-from gestores import GestorIngredientes, GestorInventario, GestorMenu, SimuladorVentas
+from gestores import GestorIngredientes, GestorInventario, GestorMenu, SimuladorVentas, IndiceDisponibilidad
+from eventos import BusEventos
+from metricas import METRICAS, medir
+from reportes import GeneradorReportes, agrupar_top_k
+from combinaciones import ExploradorCombinaciones
+from historial import HistorialVentas
+from pronostico import PronosticadorDemanda
 
 class SistemaHotDog:
     """
     Clase principal que coordina todos los módulos.
+    La construcción no carga nada: el catálogo, el menú y el estado local
+    se cargan la primera vez que se accede a ellos.
     """
 
-    def __init__(self, url_menu, url_ingredientes):
+    def __init__(self, url_menu, url_ingredientes, archivo_local="estado_local.json"):
         
-        self.ARCHIVO_LOCAL = "estado_local.json" 
+        self.ARCHIVO_LOCAL = archivo_local
+        self.ARCHIVO_HISTORIAL = "historial_ventas.json"
+        self.ARCHIVO_METRICAS = "metricas.json"
+        self.ARCHIVO_METRICAS_PROM = "metricas.prom"
+        self.TOP_K_GRAFICOS = 15
+        self.generador_reportes = GeneradorReportes(self.TOP_K_GRAFICOS)
 
         self.cargador = CargadorDatos(url_menu, url_ingredientes)
-        ingredientes_api = self.cargador.cargar_ingredientes_desde_api()
-        hotdogs_api = self.cargador.cargar_menu_desde_api(ingredientes_api)
-
-        self.gestor_ingredientes = GestorIngredientes(ingredientes_api)
-        self.inventario = Inventario() 
-        self.gestor_inventario = GestorInventario(self.inventario, self.gestor_ingredientes)
-        
-        self.gestor_menu = GestorMenu(self.gestor_ingredientes, self.gestor_inventario)
-        
-        self.simulador = SimuladorVentas(self.gestor_menu, self.gestor_inventario)
-
-        self.gestor_inventario.inicializar_inventario_con_cero()
-        
-
-        hotdogs_locales = self.cargar_estado() 
-        
-
-        self.gestor_menu.hotdogs.update(hotdogs_api) 
-    
-        self.gestor_menu.hotdogs.update(hotdogs_locales)
-        
-        print(f"Sistema inicializado. {len(self.gestor_menu.hotdogs)} hot dogs cargados.")
-
-
+        self.bus = BusEventos()
+
+        self._catalogo = None
+        self._datos_locales = None
+        self._gestor_ingredientes = None
+        self._inventario = None
+        self._gestor_inventario = None
+        self._gestor_menu = None
+        self._simulador = None
+        self._historial = None
+        self._indice_disponibilidad = None
+
+    @property
+    def gestor_ingredientes(self):
+        """
+        Etapa 1: catálogo de ingredientes (compartido entre sistemas con las mismas URLs).
+        """
+        if self._gestor_ingredientes is None:
+            ingredientes_api, _ = self._obtener_catalogo()
+            gestor_ingredientes = GestorIngredientes(dict(ingredientes_api), self.bus)
+            for id_ing, costo in self._leer_estado_local().get("costos_ingredientes", {}).items():
+                gestor_ingredientes.fijar_costo(id_ing, costo)
+            self._gestor_ingredientes = gestor_ingredientes
+        return self._gestor_ingredientes
+
+    @property
+    def inventario(self):
+        """
+        Etapa 2: existencias guardadas en el archivo local.
+        """
+        if self._inventario is None:
+            datos = self._leer_estado_local()
+            self._inventario = InventarioPorLotes()
+            self._inventario.existencias.update(datos.get("inventario", {}))
+            self._inventario.restaurar_lotes(datos.get("lotes", {}))
+        return self._inventario
+
+    @property
+    def gestor_inventario(self):
+        if self._gestor_inventario is None:
+            self._gestor_inventario = GestorInventario(self.inventario, self.gestor_ingredientes, self.bus)
+            self._gestor_inventario.inicializar_inventario_con_cero()
+        return self._gestor_inventario
+
+    @property
+    def gestor_menu(self):
+        """
+        Etapa 3: menú de la API combinado con los hot dogs locales.
+        """
+        if self._gestor_menu is None:
+            gestor_menu = GestorMenu(self.gestor_ingredientes, self.gestor_inventario, self.bus)
+            _, hotdogs_api = self._obtener_catalogo()
+            gestor_menu.hotdogs.update(self._fusionar_menus(hotdogs_api, self.cargar_estado()))
+            gestor_menu.version += 1
+            self._gestor_menu = gestor_menu
+            print(f"Menú cargado. {len(gestor_menu.hotdogs)} hot dogs disponibles.")
+        return self._gestor_menu
+
+    @property
+    def simulador(self):
+        if self._simulador is None:
+            self._simulador = SimuladorVentas(self.gestor_menu, self.gestor_inventario)
+        return self._simulador
+
+    @property
+    def indice_disponibilidad(self):
+        if self._indice_disponibilidad is None:
+            self._indice_disponibilidad = IndiceDisponibilidad(self.gestor_menu, self.bus)
+        return self._indice_disponibilidad
+
+    @property
+    def historial(self):
+        if self._historial is None:
+            self._historial = HistorialVentas.cargar(self.ARCHIVO_HISTORIAL)
+        return self._historial
+
+    def _obtener_catalogo(self):
+        if self._catalogo is None:
+            self._catalogo = self.cargador.obtener_catalogo()
+        return self._catalogo
+
+    def _leer_estado_local(self):
+        """
+        Lee el archivo de estado local una sola vez y devuelve su contenido como dict.
+        """
+        if self._datos_locales is None:
+            self._datos_locales = {}
+            try:
+                with open(self.ARCHIVO_LOCAL, 'r', encoding='utf-8') as f:
+                    self._datos_locales = json.load(f)
+                print(f"Estado local cargado desde '{self.ARCHIVO_LOCAL}'.")
+            except FileNotFoundError:
+                print(f"Advertencia: No se encontró '{self.ARCHIVO_LOCAL}'. Se usará un estado nuevo.")
+            except json.JSONDecodeError:
+                print(f"Error: El archivo '{self.ARCHIVO_LOCAL}' está corrupto. No se pudo cargar.")
+        return self._datos_locales
+
+    def _fusionar_menus(self, hotdogs_api, hotdogs_locales):
+        """
+        Combina el menú de la API con los hot dogs locales.
+        Un hot dog local con la misma huella que el de la API del mismo nombre es un
+        duplicado y se descarta; los hot dogs de la API que el usuario eliminó no se incluyen.
+        """
+        eliminados = set(self._leer_estado_local().get("hotdogs_eliminados", []))
+        menu = {id_hd: hd for id_hd, hd in hotdogs_api.items() if id_hd not in eliminados}
+        for id_hd, hd in hotdogs_locales.items():
+            original = hotdogs_api.get(id_hd)
+            if original is not None and original.huella() == hd.huella():
+                continue
+            menu[id_hd] = hd
+        return menu
+
+    def _cambios_respecto_api(self):
+        """
+        Devuelve (hot dogs que difieren de la API, IDs de la API eliminados del menú).
+        Es lo único que hace falta guardar del menú.
+        """
+        _, hotdogs_api = self._obtener_catalogo()
+        menu = self.gestor_menu.hotdogs
+        propios = [hd for id_hd, hd in menu.items()
+                   if id_hd not in hotdogs_api or (hotdogs_api[id_hd] is not hd and hotdogs_api[id_hd].huella() != hd.huella())]
+        eliminados = [id_hd for id_hd in hotdogs_api if id_hd not in menu]
+        return propios, eliminados
+
+    def _costos_modificados(self):
+        """
+        Devuelve {id: costo} de los ingredientes cuyo costo difiere del de la API,
+        para que los cambios posteriores de la API no queden tapados.
+        """
+        ingredientes_api, _ = self._obtener_catalogo()
+        modificados = {}
+        for id_ing, ing in self.gestor_ingredientes.ingredientes.items():
+            original = ingredientes_api.get(id_ing)
+            costo_api = original.costo if original is not None else 0.0
+            if ing.costo != costo_api:
+                modificados[id_ing] = ing.costo
+        return modificados
+
+    @medir("sistema.cargar_estado")
     def cargar_estado(self):
         """
-        Carga el inventario Y los hot dogs locales desde el JSON.
+        Construye los hot dogs locales guardados en el JSON (solo los que difieren del menú de la API).
         Devuelve un dict de {id: HotDog} locales.
         """
         hotdogs_locales = {}
-        try:
-            with open(self.ARCHIVO_LOCAL, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-                self.inventario.existencias.update(data.get("inventario", {}))
-                print(f"Inventario cargado desde '{self.ARCHIVO_LOCAL}'.")
-
-               
-                hotdogs_data_local = data.get("hotdogs_locales", [])
-                
-                db = self.gestor_ingredientes.ingredientes
-                
-                for item in hotdogs_data_local:
-                    try:
-                        pan = db[item["Pan"]]
-                        salchicha = db[item["Salchicha"]]
-                        toppings = [db[t] for t in item["toppings"]]
-                        lista_salsas = item.get("salsas", item.get("Salsas", []))
-                        salsas = [db[s] for s in lista_salsas]
-                        acomp_nombre = item["Acompañante"]
-                        acompanante = db.get(acomp_nombre) if acomp_nombre else None
-                        
-                        hd = HotDog(
-                            id_=item["nombre"],
-                            nombre=item["nombre"],
-                            pan=pan,
-                            salchicha=salchicha,
-                            toppings=toppings,
-                            salsas=salsas,
-                            acompanante=acompanante
-                        )
-                        hotdogs_locales[hd.id] = hd
-                    except KeyError as e:
-                        print(f"Advertencia al cargar hot dog local '{item['nombre']}': No se encontró el ingrediente '{e.args[0]}'.")
-
-        except FileNotFoundError:
-            print(f"Advertencia: No se encontró '{self.ARCHIVO_LOCAL}'. Se usará un estado nuevo.")
-        except json.JSONDecodeError:
-            print(f"Error: El archivo '{self.ARCHIVO_LOCAL}' está corrupto. No se pudo cargar.")
+        hotdogs_data_local = self._leer_estado_local().get("hotdogs_locales", [])
+        
+        db = self.gestor_ingredientes.ingredientes
+        
+        for item in hotdogs_data_local:
+            try:
+                hd = self.cargador.construir_hotdog(item, db)
+                hotdogs_locales[hd.id] = hd
+            except KeyError as e:
+                print(f"Advertencia al cargar hot dog local '{item['nombre']}': No se encontró el ingrediente '{e.args[0]}'.")
+            except ValueError as e:
+                print(f"Advertencia al cargar hot dog local '{item['nombre']}': {e}")
         
         return hotdogs_locales
 
+    @medir("sistema.guardar_estado")
     def guardar_estado(self):
         """
         Guarda el inventario y los hot dogs locales en JSON.
         """
         try:
           
-            hotdogs_serializados = [hd.to_dict() for hd in self.gestor_menu.hotdogs.values()]
+            hotdogs_propios, hotdogs_eliminados = self._cambios_respecto_api()
+            hotdogs_serializados = [hd.to_dict() for hd in hotdogs_propios]
 
             data_para_guardar = {
                 "inventario": self.inventario.existencias,
-                "hotdogs_locales": hotdogs_serializados 
+                "lotes": self.inventario.exportar_lotes(),
+                "hotdogs_locales": hotdogs_serializados,
+                "hotdogs_eliminados": hotdogs_eliminados,
+                "costos_ingredientes": self._costos_modificados()
             }
 
             with open(self.ARCHIVO_LOCAL, 'w', encoding='utf-8') as f:
@@ -105,6 +212,16 @@ class SistemaHotDog:
         except IOError as e:
             print(f"Error al guardar el estado en '{self.ARCHIVO_LOCAL}': {e}")
 
+        if self._historial is not None:
+            self._historial.guardar(self.ARCHIVO_HISTORIAL)
+
+    def exportar_metricas(self):
+        """
+        Escribe las métricas recogidas en JSON y en formato de Prometheus.
+        """
+        if METRICAS.exportar(self.ARCHIVO_METRICAS, "json") and METRICAS.exportar(self.ARCHIVO_METRICAS_PROM, "prometheus"):
+            print(f"Métricas exportadas a '{self.ARCHIVO_METRICAS}' y '{self.ARCHIVO_METRICAS_PROM}'.")
+
 
     def ejecutar(self):
         """
@@ -116,6 +233,7 @@ class SistemaHotDog:
             print("2. Gestión de inventario")
             print("3. Gestión del menú")
             print("4. Simular un día de ventas")
+            print("5. Historial de ventas")
             print("0. Salir")
 
             opcion = input("Seleccione una opción: ")
@@ -128,9 +246,13 @@ class SistemaHotDog:
                 self.menu_menu()
             elif opcion == "4":
                 self.menu_simulacion()
+            elif opcion == "5":
+                self.menu_historial()
             elif opcion == "0":
                 print("Guardando estado y saliendo...")
                 self.guardar_estado()
+                if METRICAS.activo:
+                    self.exportar_metricas()
                 break
             else:
                 print("Opción inválida, intente de nuevo.")
@@ -145,6 +267,7 @@ class SistemaHotDog:
             print("\n--- Consulta de Ingredientes ---")
             print("1. Listar ingredientes por categoría")
             print("2. Listar ingredientes por categoría y tipo")
+            print("3. Fijar costo de un ingrediente")
             print("0. Volver al menú principal")
 
             opcion = input("Seleccione una opción: ")
@@ -172,6 +295,17 @@ class SistemaHotDog:
                     for ing in resultados:
                         print(f"- {ing}")
 
+            elif opcion == "3":
+                id_ingrediente = input("Ingrese el nombre (ID) del ingrediente: ")
+                try:
+                    costo = float(input(f"Ingrese el costo unitario de '{id_ingrediente}': "))
+                    if self.gestor_ingredientes.fijar_costo(id_ingrediente, costo):
+                        print(f"¡Éxito! Costo de '{id_ingrediente}' actualizado a {costo:.2f}.")
+                    else:
+                        print(f"Error: No existe el ingrediente '{id_ingrediente}' o el costo es negativo.")
+                except ValueError:
+                    print("Error: Debe ingresar un número para el costo.")
+
             elif opcion == "0":
                 print("Volviendo al menú principal...")
                 break 
@@ -190,6 +324,7 @@ class SistemaHotDog:
             print("2. Mostrar ingredientes con bajo stock (<= 10)")
             print("3. Actualizar existencias de un ingrediente")
             print("4. Agregar existencias (Reponer)")
+            print("5. Pre-cargar stock recomendado (según historial de ventas)")
             print("0. Volver al menú principal")
 
             opcion = input("Seleccione una opción: ")
@@ -240,7 +375,15 @@ class SistemaHotDog:
                         print("Error: La cantidad a agregar debe ser positiva.")
                         continue 
 
-                    exito = self.gestor_inventario.agregar_existencia(id_ingrediente, cantidad_a_agregar)
+                    texto_fecha = input("Fecha de vencimiento del lote (AAAA-MM-DD, vacío si no vence): ").strip()
+                    vencimiento = datetime.date.fromisoformat(texto_fecha) if texto_fecha else None
+
+                    if not self.gestor_ingredientes.obtener_por_id(id_ingrediente):
+                        exito = False
+                    elif vencimiento:
+                        exito = self.gestor_inventario.agregar_lote(id_ingrediente, cantidad_a_agregar, vencimiento)
+                    else:
+                        exito = self.gestor_inventario.agregar_existencia(id_ingrediente, cantidad_a_agregar)
                     
                     if exito:
                         cantidad_total = self.gestor_inventario.buscar_existencia(id_ingrediente)
@@ -249,7 +392,10 @@ class SistemaHotDog:
                         print(f"Error: No se encontró un ingrediente con el ID '{id_ingrediente}'.")
 
                 except ValueError:
-                    print("Error: Debe ingresar un número entero para la cantidad.")
+                    print("Error: Debe ingresar un número entero y una fecha válida.")
+
+            elif opcion == "5":
+                self._menu_stock_recomendado()
 
             elif opcion == "0":
                 print("Volviendo al menú principal...")
@@ -259,6 +405,16 @@ class SistemaHotDog:
                 print("Opción inválida, intente de nuevo.")
 
 
+    def _menu_stock_recomendado(self):
+        pronosticador = PronosticadorDemanda().ajustar(self.historial)
+        recomendado = pronosticador.recomendar_stock(self.gestor_menu)
+        if not recomendado:
+            print("No hay historial de ventas suficiente para recomendar stock.")
+            return
+
+        actualizados = self.gestor_inventario.inicializar_inventario_con_recomendacion(recomendado)
+        print(f"¡Éxito! Se pre-cargó el stock recomendado en {actualizados} ingredientes sin existencias.")
+
     def menu_menu(self):
         """
         Muestra el submenú para la gestión del menú.
@@ -269,6 +425,9 @@ class SistemaHotDog:
             print("2. Ver detalle de un hot dog")
             print("3. Agregar nuevo hot dog al menú")
             print("4. Eliminar hot dog del menú")
+            print("5. Explorar combinaciones más producibles")
+            print("6. Fijar precio de un hot dog")
+            print("7. Listar hot dogs por margen")
             print("0. Volver al menú principal")
 
             opcion = input("Seleccione una opción: ")
@@ -281,6 +440,12 @@ class SistemaHotDog:
                 self._menu_agregar_hotdog()
             elif opcion == "4":
                 self._menu_eliminar_hotdog()
+            elif opcion == "5":
+                self._menu_explorar_combinaciones()
+            elif opcion == "6":
+                self._menu_fijar_precio()
+            elif opcion == "7":
+                self._menu_listar_por_margen()
             elif opcion == "0":
                 print("Volviendo al menú principal...")
                 break
@@ -297,10 +462,34 @@ class SistemaHotDog:
         hotdogs_ordenados = sorted(hotdogs, key=lambda h: h.nombre)
         
         for hd in hotdogs_ordenados:
-            hay_stock, ing_faltante = self.gestor_menu.hay_inventario_para_hotdog(hd)
+            hay_stock, ing_faltante = self.indice_disponibilidad.disponibilidad(hd.id)
             disponible = "SÍ" if hay_stock else f"NO (Falta: {ing_faltante.nombre})"
             print(f"- {hd.nombre} (Disponible: {disponible})")
 
+    def _menu_fijar_precio(self):
+        id_hotdog = input("Ingrese el nombre (ID) del hot dog: ")
+        try:
+            precio = float(input(f"Ingrese el precio de venta de '{id_hotdog}': "))
+            if self.gestor_menu.fijar_precio(id_hotdog, precio):
+                print(f"¡Éxito! Precio de '{id_hotdog}' actualizado a {precio:.2f}.")
+            else:
+                print(f"Error: No existe el hot dog '{id_hotdog}' o el precio es negativo.")
+        except ValueError:
+            print("Error: Debe ingresar un número para el precio.")
+
+    def _menu_listar_por_margen(self):
+        print("\n--- Hot Dogs por Margen ---")
+        costos = self.gestor_menu.costos_hotdogs()
+        for margen, hd in self.gestor_menu.menu_por_margen():
+            print(f"- {hd.nombre}: precio {hd.precio:.2f}, costo {costos[hd.id]:.2f}, margen {margen:.2f}")
+
+    def _menu_explorar_combinaciones(self):
+        explorador = ExploradorCombinaciones(self.gestor_ingredientes, self.gestor_inventario)
+        print(f"\n--- Combinaciones Válidas: {explorador.contar()} ---")
+        print("Las 10 más producibles con el inventario actual:")
+        for capacidad, hd in explorador.ranking(10):
+            print(f"- {hd.nombre}: {capacidad} unidades")
+
     def _menu_detalle_hotdog(self):
         id_hotdog = input("Ingrese el nombre (ID) del hot dog a ver: ")
         hd = self.gestor_menu.obtener_hotdog_por_id(id_hotdog)
@@ -309,14 +498,18 @@ class SistemaHotDog:
             print(f"Error: No se encontró un hot dog con el nombre '{id_hotdog}'.")
             return
 
+        def con_cantidad(ing):
+            cantidad = hd.cantidad_de(ing.id)
+            return ing.nombre if cantidad == 1 else f"{ing.nombre} ({cantidad} {ing.unidad})"
+
         print(f"\n--- Detalle de '{hd.nombre}' ---")
-        print(f"  Pan: {hd.pan.nombre}")
-        print(f"  Salchicha: {hd.salchicha.nombre}")
+        print(f"  Pan: {con_cantidad(hd.pan)}")
+        print(f"  Salchicha: {con_cantidad(hd.salchicha)}")
         
 
-        toppings_str = ", ".join([t.nombre for t in hd.toppings]) or "Ninguno"
-        salsas_str = ", ".join([s.nombre for s in hd.salsas]) or "Ninguna"
-        acomp_str = hd.acompanante.nombre if hd.acompanante else "Ninguno"
+        toppings_str = ", ".join([con_cantidad(t) for t in hd.toppings]) or "Ninguno"
+        salsas_str = ", ".join([con_cantidad(s) for s in hd.salsas]) or "Ninguna"
+        acomp_str = con_cantidad(hd.acompanante) if hd.acompanante else "Ninguno"
         
         print(f"  Toppings: {toppings_str}")
         print(f"  Salsas: {salsas_str}")
@@ -424,6 +617,34 @@ class SistemaHotDog:
         else:
             print(f"\nERROR AL CREAR: {mensaje}")
 
+    def menu_historial(self):
+        """
+        Muestra los más vendidos y la frecuencia de faltantes de los últimos días.
+        """
+        print("\n--- Historial de Ventas ---")
+        try:
+            dias = int(input("Ingrese cuántos días hacia atrás consultar (ej: 90): "))
+            if dias <= 0:
+                print("Error: El número de días debe ser positivo.")
+                return
+        except ValueError:
+            print("Error: Debe ingresar un número entero.")
+            return
+
+        top = self.historial.top_vendidos(10, dias)
+        print(f"\n--- Más Vendidos (últimos {dias} días) ---")
+        if not top:
+            print("No hay ventas registradas en ese período.")
+        for nombre, cantidad in top:
+            print(f"- {nombre}: {cantidad} unidades")
+
+        frecuencias = self.historial.frecuencia_faltantes(dias)
+        print(f"\n--- Días con Faltantes (últimos {dias} días) ---")
+        if not frecuencias:
+            print("No hubo faltantes en ese período.")
+        for nombre, frecuencia in sorted(frecuencias.items(), key=lambda item: item[1], reverse=True):
+            print(f"- {nombre}: faltó el {frecuencia:.0%} de los días")
+
     def menu_simulacion(self):
         """
         Pide al usuario el número de clientes y ejecuta la simulación.
@@ -438,9 +659,19 @@ class SistemaHotDog:
             print("Error: Debe ingresar un número entero.")
             return
 
+        de_prueba = input("¿Simulación de prueba, sin modificar el inventario real? (s/n): ").lower() == 's'
+
         print(f"\nSimulando {n_clientes} clientes... ¡Esto puede tardar un momento!")
         
-        reporte = self.simulador.simular_dia(n_clientes)
+        if de_prueba:
+            gestor_inventario_prueba = self.gestor_inventario.bifurcar()
+            simulador = SimuladorVentas(self.gestor_menu.bifurcar(gestor_inventario_prueba), gestor_inventario_prueba)
+            # Con la misma fecha que el día real, para descartar lo vencido antes de vender.
+            reporte = simulador.simular_dia(n_clientes, datetime.date.today())
+        else:
+            reporte = self.simulador.simular_dia(n_clientes, datetime.date.today())
+            if reporte:
+                self.historial.registrar_dia(reporte)
         
         if not reporte:
             print("No se pudo generar el reporte (quizás no hay hot dogs).")
@@ -451,6 +682,11 @@ class SistemaHotDog:
         print(f"Ventas Exitosas: {reporte['ventas_exitosas']}")
         print(f"Ventas Fallidas (por stock): {reporte['ventas_fallidas_stock']}")
         print(f"Ventas Fallidas (hot dog inválido): {reporte['ventas_fallidas_validez']}")
+        print(f"Ingresos: {reporte['ingresos']:.2f}")
+        print(f"Costos: {reporte['costos']:.2f}")
+        print(f"Margen: {reporte['margen']:.2f}")
+        if reporte.get('merma'):
+            print(f"Merma por vencimiento: {sum(reporte['merma'].values())} unidades")
         print("---------------------------------")
    
         print("\n--- Hot Dogs Vendidos ---")
@@ -469,8 +705,11 @@ class SistemaHotDog:
             for nombre, cantidad in faltantes_ordenados:
                 print(f"- {nombre}: Faltó {cantidad} veces")
         
-        print("\n¡Importante! El inventario ha sido actualizado.")
-        print("Recuerde Guardar (Opción 0) si desea que los cambios persistan.")
+        if de_prueba:
+            print("\nSimulación de prueba: el inventario real no fue modificado.")
+        else:
+            print("\n¡Importante! El inventario ha sido actualizado.")
+            print("Recuerde Guardar (Opción 0) si desea que los cambios persistan.")
 
 
         self._mostrar_grafico_ventas(reporte)
@@ -478,6 +717,7 @@ class SistemaHotDog:
     def _mostrar_grafico_ventas(self, reporte):
         """
         Usa matplotlib para generar y mostrar los gráficos del reporte.
+        Solo se dibujan los más frecuentes; el resto se agrupa en 'Otros'.
         """
         print("\nGenerando gráficas del reporte...")
 
@@ -486,8 +726,9 @@ class SistemaHotDog:
             print("No hay datos de ventas para graficar.")
         else:
          
-            nombres = list(datos_ventas.keys())
-            cantidades = list(datos_ventas.values())
+            agrupados = agrupar_top_k(datos_ventas, self.TOP_K_GRAFICOS)
+            nombres = [nombre for nombre, _ in agrupados]
+            cantidades = [cantidad for _, cantidad in agrupados]
 
             plt.figure(1, figsize=(10, 6)) 
             plt.bar(nombres, cantidades, color='green')
@@ -501,8 +742,9 @@ class SistemaHotDog:
         if not datos_faltantes:
             print("No hay datos de ingredientes faltantes para graficar.")
         else:
-            nombres_ing = list(datos_faltantes.keys())
-            cantidades_ing = list(datos_faltantes.values())
+            agrupados_ing = agrupar_top_k(datos_faltantes, self.TOP_K_GRAFICOS)
+            nombres_ing = [nombre for nombre, _ in agrupados_ing]
+            cantidades_ing = [cantidad for _, cantidad in agrupados_ing]
 
             plt.figure(2, figsize=(10, 6)) 
             plt.bar(nombres_ing, cantidades_ing, color='red')
@@ -517,4 +759,11 @@ class SistemaHotDog:
             print("Mostrando gráficas... Cierra las ventanas de las gráficas para continuar.")
             plt.show() 
         else:
-            print("No se generaron gráficas por falta de datos.")
\ No newline at end of file
+            print("No se generaron gráficas por falta de datos.")
+
+    def exportar_reporte(self, reporte, directorio, formato="png"):
+        """
+        Escribe los gráficos y el resumen del reporte en disco, sin abrir ventanas.
+        Devuelve la lista de archivos generados.
+        """
+        return self.generador_reportes.exportar(reporte, directorio, formato)
@@ -0,0 +1,99 @@
+import math
+
+
+# Las conversiones se resuelven una sola vez al cargar el menú: las recetas y el
+# inventario trabajan siempre con enteros en la unidad base de cada ingrediente.
+# unidad: (dimensión, factor respecto a la unidad de referencia de esa dimensión)
+FACTORES = {
+    "unidad": ("unidad", 1),
+    "unidades": ("unidad", 1),
+    "u": ("unidad", 1),
+    "mg": ("g", 0.001),
+    "g": ("g", 1),
+    "kg": ("g", 1000),
+    "ml": ("ml", 1),
+    "cl": ("ml", 10),
+    "l": ("ml", 1000),
+}
+
+
+def _numero(valor, original):
+    """
+    Devuelve 'valor' como número finito o lanza ValueError.
+    """
+    if isinstance(valor, str):
+        try:
+            valor = float(valor)
+        except ValueError:
+            raise ValueError(f"Cantidad inválida: '{original}'.") from None
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+        raise ValueError(f"Cantidad inválida: '{original}'.")
+    return valor
+
+
+def parsear_cantidad(valor):
+    """
+    Acepta 2, 2.5, "30 g" o {"cantidad": 30, "unidad": "g"}.
+    Devuelve (cantidad, unidad), con unidad None si no se indicó.
+    Lanza ValueError si el valor no tiene alguna de esas formas.
+    """
+    if isinstance(valor, dict):
+        if "cantidad" not in valor:
+            raise ValueError(f"Cantidad inválida: falta 'cantidad' en {valor}.")
+        unidad = valor.get("unidad")
+        if unidad is not None and not isinstance(unidad, str):
+            raise ValueError(f"Unidad inválida: '{unidad}'.")
+        return _numero(valor["cantidad"], valor), unidad
+    if isinstance(valor, str):
+        partes = valor.split()
+        if len(partes) == 1:
+            return _numero(partes[0], valor), None
+        if len(partes) == 2:
+            return _numero(partes[0], valor), partes[1]
+        raise ValueError(f"Cantidad inválida: '{valor}'.")
+    return _numero(valor, valor), None
+
+
+def a_unidad_base(cantidad, unidad, unidad_base):
+    """
+    Convierte 'cantidad' expresada en 'unidad' a un entero en 'unidad_base'.
+    Lanza ValueError si las unidades no son compatibles o si el resultado no es
+    un número entero positivo de 'unidad_base' (no se redondea).
+    Si la cantidad ya está en 'unidad_base' (o no indica unidad) no hace falta
+    que esa unidad esté en FACTORES, así que sirven unidades como "rebanada".
+    """
+    unidad_base = (unidad_base or "unidad").strip().lower()
+    unidad = unidad_base if unidad is None else unidad.strip().lower()
+
+    if unidad == unidad_base:
+        convertida = cantidad
+    else:
+        if unidad not in FACTORES or unidad_base not in FACTORES:
+            raise ValueError(f"No se puede convertir '{unidad}' a '{unidad_base}': unidad desconocida.")
+        destino, factor = FACTORES[unidad]
+        destino_base, factor_base = FACTORES[unidad_base]
+        if destino != destino_base:
+            raise ValueError(f"No se puede convertir '{unidad}' a '{unidad_base}'.")
+        convertida = cantidad * factor / factor_base
+
+    entera = round(convertida)
+    # La tolerancia solo absorbe el error de punto flotante de factores como 0.001.
+    if abs(convertida - entera) > 1e-9 * max(1, abs(convertida)):
+        raise ValueError(f"La cantidad {cantidad} {unidad} no es un número entero de '{unidad_base}'.")
+    if entera <= 0:
+        raise ValueError(f"La cantidad {cantidad} {unidad} debe ser de al menos una unidad de '{unidad_base}'.")
+    return entera
+
+
+def resolver_cantidades(cantidades, ingredientes_db):
+    """
+    Convierte el dict 'cantidades' de una receta en JSON a {id_ingrediente: entero en unidad base}.
+    Lanza KeyError si un ingrediente no existe y ValueError si una cantidad no es válida.
+    """
+    if cantidades is not None and not isinstance(cantidades, dict):
+        raise ValueError(f"Las cantidades deben ser un objeto {{ingrediente: cantidad}}, no '{cantidades}'.")
+    resueltas = {}
+    for id_ing, valor in (cantidades or {}).items():
+        cantidad, unidad = parsear_cantidad(valor)
+        resueltas[id_ing] = a_unidad_base(cantidad, unidad, ingredientes_db[id_ing].unidad)
+    return resueltas
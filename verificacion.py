@@ -0,0 +1,377 @@
+import argparse
+import datetime
+import random
+import sys
+import threading
+import time
+from modelos import Ingrediente, HotDog, Inventario, InventarioConcurrente, InventarioPorLotes
+from gestores import GestorIngredientes, GestorInventario, GestorMenu, SimuladorVentas
+from eventos import BusEventos
+
+# Prueba diferencial: compara las implementaciones del sistema contra una
+# implementación de referencia mínima (dicts y listas, sin optimizaciones)
+# con catálogos, menús, inventarios (con lotes perecederos) y semillas aleatorias.
+
+# Día simulado; los lotes generados vencen alrededor de esta fecha.
+FECHA = datetime.date(2024, 3, 15)
+
+
+def validar_referencia(hotdog, ingredientes):
+    """
+    Reglas de validación de GestorMenu.validar_hotdog, escritas de la forma más directa.
+    """
+    if hotdog.pan.longitud is None or hotdog.salchicha.longitud is None:
+        return False
+    if hotdog.pan.longitud < hotdog.salchicha.longitud:
+        return False
+    return all(ing.id in ingredientes for ing in hotdog.ingredientes_totales())
+
+
+def _consumir_referencia(lotes, cantidad):
+    # FEFO: primero lo que vence antes; a igual fecha, el lote agregado antes.
+    lotes.sort()
+    for lote in lotes:
+        usado = min(lote[2], cantidad)
+        lote[2] -= usado
+        cantidad -= usado
+    lotes[:] = [lote for lote in lotes if lote[2] > 0]
+
+
+def simular_referencia(hotdogs, existencias, lotes, ingredientes, num_clientes, semilla, fecha=None):
+    """
+    Algoritmo de SimuladorVentas.simular_dia sobre dicts y listas.
+    'existencias' es el stock sin lote y 'lotes' es {id: [(cantidad, vencimiento), ...]}.
+    Si se indica 'fecha', antes de vender se descarta lo vencido.
+    Devuelve (estadisticas, existencias_finales, lotes_finales como en exportar_lotes).
+    """
+    rng = random.Random(semilla)
+    secuencia = 0
+    lotes_ref = {}
+    for id_ing, lista in lotes.items():
+        for cantidad, vencimiento in lista:
+            secuencia += 1
+            lotes_ref.setdefault(id_ing, []).append([vencimiento, secuencia, cantidad])
+    totales = {id_ing: existencias.get(id_ing, 0) + sum(lote[2] for lote in lotes_ref.get(id_ing, []))
+               for id_ing in ingredientes}
+
+    estadisticas = {
+        "ventas_exitosas": 0,
+        "ventas_fallidas_stock": 0,
+        "ventas_fallidas_validez": 0,
+        "hotdogs_vendidos": {},
+        "ingredientes_faltantes": {}
+    }
+
+    if fecha is not None:
+        merma = {}
+        for id_ing, lista in lotes_ref.items():
+            descartado = sum(lote[2] for lote in lista if lote[0] < fecha)
+            lista[:] = [lote for lote in lista if lote[0] >= fecha]
+            if descartado:
+                totales[id_ing] -= descartado
+                merma[ingredientes[id_ing].nombre] = descartado
+        estadisticas["merma"] = merma
+
+    for _ in range(num_clientes):
+        hd = rng.choice(hotdogs)
+        if not validar_referencia(hd, ingredientes):
+            estadisticas["ventas_fallidas_validez"] += 1
+            continue
+
+        receta = [(ing, hd.cantidades.get(ing.id, 1)) for ing in hd.ingredientes_totales()]
+        faltante = None
+        for ing, cantidad in receta:
+            if totales.get(ing.id, 0) < cantidad:
+                faltante = ing
+                break
+
+        if faltante is None:
+            for ing, cantidad in receta:
+                totales[ing.id] -= cantidad
+                _consumir_referencia(lotes_ref.get(ing.id, []), cantidad)
+            estadisticas["ventas_exitosas"] += 1
+            estadisticas["hotdogs_vendidos"][hd.nombre] = estadisticas["hotdogs_vendidos"].get(hd.nombre, 0) + 1
+        else:
+            estadisticas["ventas_fallidas_stock"] += 1
+            estadisticas["ingredientes_faltantes"][faltante.nombre] = estadisticas["ingredientes_faltantes"].get(faltante.nombre, 0) + 1
+
+    lotes_finales = {}
+    for id_ing, lista in lotes_ref.items():
+        lista.sort()
+        if lista:
+            lotes_finales[id_ing] = [[lote[2], lote[0].isoformat()] for lote in lista]
+    return estadisticas, totales, lotes_finales
+
+
+def generar_caso(rng):
+    """
+    Genera un catálogo, un menú (con hot dogs válidos e inválidos), un stock sin
+    lote y lotes con vencimiento alrededor de FECHA, todos aleatorios.
+    Devuelve (ingredientes, hotdogs, existencias, lotes).
+    """
+    ingredientes = {}
+
+    def crear(categoria, cantidad, con_longitud):
+        creados = []
+        for i in range(cantidad):
+            longitud = rng.randint(4, 12) if con_longitud and rng.random() > 0.05 else None
+            ing = Ingrediente(f"{categoria}-{i}", f"{categoria}-{i}", categoria, "tipo", longitud)
+            ingredientes[ing.id] = ing
+            creados.append(ing)
+        return creados
+
+    panes = crear("Pan", rng.randint(1, 5), True)
+    salchichas = crear("Salchicha", rng.randint(1, 5), True)
+    toppings = crear("toppings", rng.randint(0, 8), False)
+    salsas = crear("Salsa", rng.randint(0, 6), False)
+    acompanantes = crear("Acompañante", rng.randint(0, 3), False)
+
+    hotdogs = []
+    for i in range(rng.randint(1, 12)):
+        elegidos_toppings = rng.sample(toppings, rng.randint(0, min(3, len(toppings))))
+        elegidos_salsas = rng.sample(salsas, rng.randint(0, min(2, len(salsas))))
+        acompanante = rng.choice(acompanantes) if acompanantes and rng.random() < 0.5 else None
+        hd = HotDog(f"hd-{i}", f"hd-{i}", rng.choice(panes), rng.choice(salchichas),
+                    elegidos_toppings, elegidos_salsas, acompanante)
+        for ing in hd.ingredientes_totales():
+            if rng.random() < 0.2:
+                hd.cantidades[ing.id] = rng.randint(2, 5)
+        hotdogs.append(hd)
+
+    # Algunos ingredientes del menú desaparecen del catálogo para probar la validación.
+    if rng.random() < 0.2 and toppings:
+        del ingredientes[rng.choice(toppings).id]
+
+    existencias = {id_ing: rng.randint(0, 25) for id_ing in ingredientes}
+    lotes = {}
+    for id_ing in ingredientes:
+        if rng.random() < 0.6:
+            lotes[id_ing] = [(rng.randint(1, 15), FECHA + datetime.timedelta(days=rng.randint(-3, 5)))
+                             for _ in range(rng.randint(1, 4))]
+    return ingredientes, hotdogs, existencias, lotes
+
+
+def _cargar(inventario, existencias, lotes):
+    for id_ing, cantidad in existencias.items():
+        inventario.set_cantidad(id_ing, cantidad)
+    for id_ing, lista in lotes.items():
+        for cantidad, vencimiento in lista:
+            inventario.agregar_lote(id_ing, cantidad, vencimiento)
+    return inventario
+
+
+def _armar(ingredientes, hotdogs, inventario, bus=None):
+    gestor_ingredientes = GestorIngredientes(dict(ingredientes), bus)
+    gestor_inventario = GestorInventario(inventario, gestor_ingredientes, bus)
+    gestor_menu = GestorMenu(gestor_ingredientes, gestor_inventario, bus)
+    for hd in hotdogs:
+        gestor_menu.hotdogs[hd.id] = hd
+    return gestor_menu, gestor_inventario
+
+
+def _simular(gestor_menu, gestor_inventario, clientes, semilla, fecha=None):
+    random.seed(semilla)
+    inicio = time.perf_counter()
+    reporte = SimuladorVentas(gestor_menu, gestor_inventario).simular_dia(clientes, fecha)
+    return reporte, time.perf_counter() - inicio
+
+
+def _diferencias(gestor_menu, hotdogs, ingredientes, reporte, inventario, referencia):
+    """
+    Compara validación, estadísticas y stock final con la referencia (estadisticas, stock, lotes).
+    """
+    esperado, stock_esperado, _ = referencia
+    problemas = [f"validación de '{hd.id}'" for hd in hotdogs
+                 if gestor_menu.validar_hotdog(hd)[0] != validar_referencia(hd, ingredientes)]
+    problemas += [f"estadística '{clave}'" for clave in esperado if reporte.get(clave) != esperado[clave]]
+    if {id_ing: inventario.obtener_cantidad(id_ing) for id_ing in stock_esperado} != stock_esperado:
+        problemas.append("stock final")
+    return problemas
+
+
+def _probar_simple(crear_inventario, con_bus=False):
+    """
+    Implementación sin vencimientos: se compara con la referencia sin fecha.
+    """
+    def probar(caso, semilla, clientes, referencias):
+        ingredientes, hotdogs, existencias, lotes = caso
+        inventario = _cargar(crear_inventario(), existencias, lotes)
+        gestor_menu, gestor_inventario = _armar(ingredientes, hotdogs, inventario, BusEventos() if con_bus else None)
+        reporte, segundos = _simular(gestor_menu, gestor_inventario, clientes, semilla)
+        return segundos, _diferencias(gestor_menu, hotdogs, ingredientes, reporte, inventario, referencias["sin_fecha"])
+    return probar
+
+
+def _probar_lotes(caso, semilla, clientes, referencias):
+    """
+    InventarioPorLotes simulando un día con fecha: descarta lo vencido, vende en
+    orden FEFO y se comparan también la merma y los lotes que quedan.
+    """
+    ingredientes, hotdogs, existencias, lotes = caso
+    inventario = _cargar(InventarioPorLotes(), existencias, lotes)
+    gestor_menu, gestor_inventario = _armar(ingredientes, hotdogs, inventario)
+    reporte, segundos = _simular(gestor_menu, gestor_inventario, clientes, semilla, FECHA)
+
+    referencia = referencias["con_fecha"]
+    problemas = _diferencias(gestor_menu, hotdogs, ingredientes, reporte, inventario, referencia)
+    if inventario.exportar_lotes() != referencia[2]:
+        problemas.append("lotes finales")
+    return segundos, problemas
+
+
+def _probar_bifurcado(crear_inventario, fecha=None):
+    """
+    Simula sobre una bifurcación: el inventario base no debe cambiar hasta confirmar,
+    y al confirmar debe quedar como la referencia (lotes incluidos, si los maneja).
+    """
+    def probar(caso, semilla, clientes, referencias):
+        ingredientes, hotdogs, existencias, lotes = caso
+        base = _cargar(crear_inventario(), existencias, lotes)
+        gestor_menu, gestor_inventario = _armar(ingredientes, hotdogs, base)
+        con_lotes = isinstance(base, InventarioPorLotes)
+        antes = (dict(base.existencias), base.exportar_lotes() if con_lotes else None)
+
+        gestor_inventario_b = gestor_inventario.bifurcar()
+        gestor_menu_b = gestor_menu.bifurcar(gestor_inventario_b)
+        reporte, segundos = _simular(gestor_menu_b, gestor_inventario_b, clientes, semilla, fecha)
+        bifurcado = gestor_inventario_b.inventario
+
+        referencia = referencias["sin_fecha" if fecha is None else "con_fecha"]
+        problemas = _diferencias(gestor_menu_b, hotdogs, ingredientes, reporte, bifurcado, referencia)
+        if con_lotes and not isinstance(bifurcado, InventarioPorLotes):
+            problemas.append("la bifurcación no maneja lotes")
+        elif con_lotes and bifurcado.exportar_lotes() != referencia[2]:
+            problemas.append("lotes de la bifurcación")
+        if (dict(base.existencias), base.exportar_lotes() if con_lotes else None) != antes:
+            problemas.append("el inventario base cambió antes de confirmar")
+
+        bifurcado.confirmar()
+        if {id_ing: base.obtener_cantidad(id_ing) for id_ing in referencia[1]} != referencia[1]:
+            problemas.append("stock del base después de confirmar")
+        if con_lotes and base.exportar_lotes() != referencia[2]:
+            problemas.append("lotes del base después de confirmar")
+        return segundos, problemas
+    return probar
+
+
+# nombre: función (caso, semilla, clientes, referencias) -> (segundos, problemas)
+IMPLEMENTACIONES = {
+    "Inventario": _probar_simple(Inventario),
+    "InventarioConcurrente": _probar_simple(InventarioConcurrente),
+    "InventarioPorLotes": _probar_lotes,
+    "InventarioBifurcado": _probar_bifurcado(Inventario),
+    "InventarioPorLotesBifurcado": _probar_bifurcado(InventarioPorLotes),
+    "InventarioPorLotesBifurcado+fecha": _probar_bifurcado(InventarioPorLotes, FECHA),
+    "Inventario+BusEventos": _probar_simple(Inventario, con_bus=True),
+}
+
+
+def verificar_concurrencia(caso, clientes, hilos=4):
+    """
+    Vende con varios hilos a la vez sobre un InventarioConcurrente y comprueba que
+    el stock se conserva: lo que falta de cada ingrediente es exactamente lo que
+    usaron los hot dogs vendidos, ningún stock queda negativo y todos los clientes
+    se cuentan. El orden de las ventas no es determinista, así que no hay referencia.
+    """
+    ingredientes, hotdogs, existencias, lotes = caso
+    inventario = _cargar(InventarioConcurrente(), existencias, lotes)
+    gestor_menu, gestor_inventario = _armar(ingredientes, hotdogs, inventario)
+    iniciales = dict(inventario.existencias)
+
+    reportes = []
+    def vender():
+        reportes.append(SimuladorVentas(gestor_menu, gestor_inventario).simular_dia(clientes))
+
+    # Un intervalo de cambio corto fuerza más intercalados entre hilos.
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        trabajadores = [threading.Thread(target=vender) for _ in range(hilos)]
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    por_nombre = {hd.nombre: hd for hd in hotdogs}
+    consumido = {}
+    atendidos = 0
+    for reporte in reportes:
+        atendidos += reporte["ventas_exitosas"] + reporte["ventas_fallidas_stock"] + reporte["ventas_fallidas_validez"]
+        for nombre, cantidad in reporte["hotdogs_vendidos"].items():
+            for ing, unidades in por_nombre[nombre].receta():
+                consumido[ing.id] = consumido.get(ing.id, 0) + cantidad * unidades
+
+    problemas = []
+    if atendidos != clientes * hilos:
+        problemas.append("clientes atendidos")
+    for id_ing, inicial in iniciales.items():
+        final = inventario.obtener_cantidad(id_ing)
+        if final < 0 or inicial - final != consumido.get(id_ing, 0):
+            problemas.append(f"conservación del stock de '{id_ing}'")
+    return problemas
+
+
+def verificar(casos=100, semilla=0, clientes=300, hilos=4):
+    """
+    Ejecuta 'casos' casos aleatorios. Devuelve (discrepancias, tiempos), donde
+    'tiempos' es {implementación: segundos totales} incluyendo la referencia.
+    """
+    rng = random.Random(semilla)
+    discrepancias = []
+    tiempos = {"referencia": 0.0}
+    tiempos.update({nombre: 0.0 for nombre in IMPLEMENTACIONES})
+
+    for numero in range(casos):
+        caso = generar_caso(rng)
+        semilla_caso = rng.randrange(2 ** 32)
+        ingredientes, hotdogs, existencias, lotes = caso
+
+        inicio = time.perf_counter()
+        referencias = {
+            "sin_fecha": simular_referencia(hotdogs, existencias, lotes, ingredientes, clientes, semilla_caso),
+            "con_fecha": simular_referencia(hotdogs, existencias, lotes, ingredientes, clientes, semilla_caso, FECHA)
+        }
+        tiempos["referencia"] += (time.perf_counter() - inicio) / 2
+
+        for nombre, probar in IMPLEMENTACIONES.items():
+            segundos, problemas = probar(caso, semilla_caso, clientes, referencias)
+            tiempos[nombre] += segundos
+            discrepancias.extend((numero, nombre, detalle) for detalle in problemas)
+
+        if hilos > 1:
+            discrepancias.extend((numero, f"InventarioConcurrente ({hilos} hilos)", detalle)
+                                 for detalle in verificar_concurrencia(caso, clientes, hilos))
+
+    return discrepancias, tiempos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba diferencial de las implementaciones del simulador.")
+    parser.add_argument("--casos", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--clientes", type=int, default=300)
+    parser.add_argument("--hilos", type=int, default=4, help="Hilos de la prueba de concurrencia (1 la desactiva).")
+    args = parser.parse_args(argv)
+
+    discrepancias, tiempos = verificar(args.casos, args.semilla, args.clientes, args.hilos)
+
+    print(f"=== Prueba diferencial ({args.casos} casos, {args.clientes} clientes, semilla {args.semilla}) ===")
+    referencia = tiempos["referencia"]
+    for nombre, segundos in tiempos.items():
+        relativo = referencia / segundos if segundos else 0.0
+        print(f"- {nombre}: {segundos * 1000:.1f} ms ({relativo:.2f}x la referencia)")
+
+    if not discrepancias:
+        print("Todas las implementaciones coinciden con la referencia.")
+        return 0
+
+    print(f"\n{len(discrepancias)} discrepancias:")
+    for numero, nombre, detalle in discrepancias[:20]:
+        print(f"- Caso {numero}, {nombre}: {detalle}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())